@@ -0,0 +1,271 @@
+import asyncio
+import logging
+from typing import Iterable, Optional, Union
+
+import httpx
+
+from onerecord.exceptions import ONERecordClientException
+from onerecord.models.api import Notification, PatchRequest
+from onerecord.models.cargo import Event, LogisticsObject
+from onerecord.models.enums import LogisticsObjectType
+from onerecord.utils import (
+    generate_patch_request,
+    json_to_events,
+    json_to_logistics_object,
+    json_to_logistics_objects,
+    thing_to_json,
+)
+
+logger = logging.getLogger("onerecord-client")
+
+
+class AsyncONERecordClient:
+    """
+    AsyncONERecordClient object to interact with an ONE Record API using asyncio.
+    Mirrors the ONERecordClient but all requests are coroutines
+    running on a non-blocking httpx transport, so that many requests
+    to one or more ONE Record APIs can be in flight at once.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 8080,
+        company_identifier: str = None,
+        ssl: bool = False,
+        verify_ssl: bool = True,
+        timeout=None,
+        proxies=None,
+        cert=None,
+        client=None,
+        headers=None,
+    ):
+        """Construct a new AsyncONERecordClient object."""
+        self._host = host
+        self._port = int(port)
+        if not company_identifier:
+            raise ValueError("company_identifer is required parameter but missing")
+        else:
+            self.company_identifier = company_identifier
+            self._path = f"/companies/{company_identifier}"
+
+        self._scheme = "http"
+
+        if ssl is True:
+            self._scheme = "https"
+
+        if cert and not ssl:
+            raise ValueError("Client certificate provided but ssl is disabled.")
+
+        self._baseurl = "{}://{}:{}{}".format(
+            self._scheme, self._host, self._port, self._path
+        )
+
+        if headers is None:
+            headers = {}
+        headers.setdefault("Content-Type", "application/ld+json")
+        headers.setdefault("Accept", "application/ld+json")
+        self._headers = headers
+
+        self._timeout = timeout
+
+        if not client:
+            mounts = None
+            if proxies:
+                mounts = {
+                    scheme
+                    if scheme.endswith("://")
+                    else f"{scheme}://": (
+                        httpx.AsyncHTTPTransport(
+                            proxy=proxy, verify=verify_ssl, cert=cert
+                        )
+                    )
+                    for scheme, proxy in proxies.items()
+                }
+            client = httpx.AsyncClient(
+                verify=verify_ssl,
+                cert=cert,
+                mounts=mounts,
+                timeout=self._timeout,
+            )
+        client.headers.update(self._headers)
+
+        self._client = client
+
+    async def close(self):
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def create_logistics_object(
+        self, logistics_object: LogisticsObject
+    ) -> LogisticsObject:
+        """Creates a logistics object on a ONE Record API"""
+        if type(logistics_object) not in LogisticsObject.__subclasses__():
+            raise ValueError("No appropriate LogisticsObject provided")
+        data = thing_to_json(logistics_object)
+        logger.debug(f"Create LogicisObject: {data.decode('utf-8')}")
+        url = f"{self._baseurl}/los"
+        response = await self._client.post(url=url, content=data)
+
+        if response.status_code == 201 and "Location" in response.headers:
+            logistics_object.id = response.headers["location"]
+            return logistics_object
+        else:
+            raise ONERecordClientException(
+                message="Could not create LogisticsObject",
+                code=response.status_code,
+            )
+
+    async def create_logistics_objects(
+        self, logistics_objects: Iterable[LogisticsObject], max_in_flight: int = 10
+    ) -> list[Union[LogisticsObject, Exception]]:
+        """
+        Creates many logistics objects on a ONE Record API concurrently,
+        with at most max_in_flight requests running at the same time.
+        Returns one result per input in the same order: either the created
+        LogisticsObject with its assigned @id or the exception that occurred.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def create(
+            logistics_object: LogisticsObject,
+        ) -> Union[LogisticsObject, Exception]:
+            async with semaphore:
+                try:
+                    return await self.create_logistics_object(
+                        logistics_object=logistics_object
+                    )
+                except (ONERecordClientException, ValueError, httpx.HTTPError) as e:
+                    logger.warning(f"Could not create LogisticsObject: {e}")
+                    return e
+
+        return list(
+            await asyncio.gather(
+                *(create(logistics_object) for logistics_object in logistics_objects)
+            )
+        )
+
+    async def update_logistics_object(
+        self, updated_logistics_object: LogisticsObject
+    ) -> bool:
+        """Update a logistics object on a ONE Record API"""
+        url: str = updated_logistics_object.id
+        original_logistics_object: Optional[
+            LogisticsObject
+        ] = await self.get_logistics_object_by_uri(url)
+
+        if original_logistics_object:
+            patch_request: PatchRequest = generate_patch_request(
+                original_logistics_object=original_logistics_object,
+                updated_logistics_object=updated_logistics_object,
+                requestor_company_identifier=self.company_identifier,
+            )
+            if patch_request.operations is None or len(patch_request.operations) == 0:
+                raise ValueError("LogisticsObject seems to be up-to-date")
+            data = thing_to_json(patch_request)
+            logger.debug(f"Patch LogisticsObject with {data.decode('utf-8')}")
+            response = await self._client.patch(url=url, content=data)
+
+            if response.status_code == 204:
+                return True
+            elif response.status_code == 404:
+                raise ONERecordClientException(
+                    message=f'LogisticsObject[@id="{updated_logistics_object.id} not found"]',
+                    code=response.status_code,
+                )
+            else:
+                raise ONERecordClientException(
+                    message=f'Could not update LogisticsObject[@id="{updated_logistics_object.id}"]',
+                    code=response.status_code,
+                )
+        else:
+            logger.warning(f"LogisticsObject[@id={url}] not found")
+        return False
+
+    async def get_logistics_objects(
+        self, logistics_object_type: LogisticsObjectType = None
+    ) -> list[LogisticsObject]:
+        """Returns a list of logistics objects from a ONE Record API"""
+        url = f"{self._baseurl}/los"
+        if logistics_object_type:
+            url = f"{url}?type={logistics_object_type.value}"
+        logger.debug(f"Get LogicisObjects from {url}")
+        response = await self._client.get(url)
+        if response.status_code == 200:
+            return json_to_logistics_objects(logistics_objects_json=response.content)
+        else:
+            raise ONERecordClientException(
+                message="Could not get LogisticsObject",
+                code=response.status_code,
+            )
+
+    async def get_logistics_object_by_uri(self, uri: str) -> Optional[LogisticsObject]:
+        """Returns a logistics object by URI"""
+        logger.debug(f"Get LogicisObject from {uri}")
+        response = await self._client.get(uri)
+        if response.status_code == 200:
+            return json_to_logistics_object(logistics_object_json=response.content)
+
+        elif response.status_code == 404:
+            raise ONERecordClientException(
+                message="LogisticsObject does not exist",
+                code=response.status_code,
+            )
+        else:
+            raise ONERecordClientException(
+                message="Could not get LogisticsObject",
+                code=response.status_code,
+            )
+
+    async def create_event(
+        self, logistics_object_uri: str, event: Event
+    ) -> Optional[bool]:
+        """Creates Events object for particular LogisticsObject"""
+        logger.debug(f"Create Event for LogisticsObject[@id={logistics_object_uri}]")
+        url = f"{logistics_object_uri}/events"
+        response = await self._client.post(url=url, content=thing_to_json(event))
+
+        if response.status_code == 201:
+            return True
+        else:
+            raise ONERecordClientException(
+                message=f'Could not create Event for LogisticsObject[@id="{logistics_object_uri}"]',
+                code=response.status_code,
+            )
+
+    async def get_events_by_logistics_objects_uri(
+        self, logistics_object_uri: str
+    ) -> list[Event]:
+        url = f"{logistics_object_uri}/events"
+        response = await self._client.get(url=url)
+        logger.debug(f"Get Events for LogisticsObject[@id={logistics_object_uri}]")
+        if response.status_code == 200:
+            return json_to_events(events_json=response.content)
+        else:
+            raise ONERecordClientException(
+                message=f'Could not get Events for LogisticsObject[@id="{logistics_object_uri}"]',
+                code=response.status_code,
+            )
+
+    async def send_notification(
+        self, callback_url: str, notification: Notification
+    ) -> Optional[bool]:
+        data = thing_to_json(notification)
+        logger.debug(
+            f"Send Notification to {callback_url}. Data: {data.decode('utf-8')}"
+        )
+        response = await self._client.post(url=callback_url, content=data)
+        if response.status_code == 200:
+            return True
+        else:
+            raise ONERecordClientException(
+                message=f"Could not send Notifcation to {callback_url}",
+                code=response.status_code,
+            )
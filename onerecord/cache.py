@@ -0,0 +1,66 @@
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from onerecord.models.cargo import LogisticsObject
+
+
+class CacheEntry(NamedTuple):
+    logistics_object: LogisticsObject
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class LogisticsObjectCache:
+    """
+    Thread-safe LRU cache of parsed LogisticsObjects keyed by their URI.
+    Every entry keeps the ETag and Last-Modified validators of the response
+    it was parsed from, so that the ONERecordClient can revalidate it with a
+    conditional GET instead of downloading and parsing the object again.
+    A cache can be shared between several clients.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._max_size = max_size
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, uri: str) -> bool:
+        return uri in self._entries
+
+    def get(self, uri: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry is not None:
+                self._entries.move_to_end(uri)
+            return entry
+
+    def put(
+        self,
+        uri: str,
+        logistics_object: LogisticsObject,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._entries[uri] = CacheEntry(
+                logistics_object=logistics_object,
+                etag=etag,
+                last_modified=last_modified,
+            )
+            self._entries.move_to_end(uri)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, uri: str) -> None:
+        with self._lock:
+            self._entries.pop(uri, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
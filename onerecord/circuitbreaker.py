@@ -0,0 +1,142 @@
+import enum
+import threading
+import time
+from typing import Callable, Optional
+
+from onerecord.exceptions import CircuitBreakerOpenException
+
+
+class CircuitBreakerState(enum.Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class _Circuit:
+    def __init__(self):
+        self.state: CircuitBreakerState = CircuitBreakerState.CLOSED
+        self.failures: int = 0
+        self.opened_at: float = 0.0
+        self.probes: int = 0
+
+
+class CircuitBreaker:
+    """
+    Per host circuit breaker for the ONERecordClient.
+    After failure_threshold consecutive errors, timeouts or 5xx responses
+    of a host its circuit opens and requests to that host fail fast with a
+    CircuitBreakerOpenException. After recovery_timeout seconds the circuit
+    becomes half-open and lets half_open_max_calls probe requests pass:
+    a successful probe closes the circuit, a failed one opens it again.
+    A CircuitBreaker can be shared across threads and clients.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        failure_status_codes: frozenset = frozenset(range(500, 600)),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        if half_open_max_calls < 1:
+            raise ValueError("half_open_max_calls must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_status_codes = failure_status_codes
+        self._clock = clock
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _get_circuit(self, host: str) -> _Circuit:
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits.setdefault(host, _Circuit())
+        return circuit
+
+    def _update_state(self, circuit: _Circuit) -> None:
+        if (
+            circuit.state is CircuitBreakerState.OPEN
+            and self._clock() - circuit.opened_at >= self.recovery_timeout
+        ):
+            circuit.state = CircuitBreakerState.HALF_OPEN
+            circuit.probes = 0
+
+    def _open(self, circuit: _Circuit) -> None:
+        circuit.state = CircuitBreakerState.OPEN
+        circuit.opened_at = self._clock()
+        circuit.probes = 0
+
+    def get_state(self, host: str) -> CircuitBreakerState:
+        """Returns the state of the circuit of a host (host:port)"""
+        with self._lock:
+            circuit = self._get_circuit(host)
+            self._update_state(circuit)
+            return circuit.state
+
+    def get_states(self) -> dict[str, CircuitBreakerState]:
+        """Returns the states of the circuits of all hosts seen so far"""
+        with self._lock:
+            for circuit in self._circuits.values():
+                self._update_state(circuit)
+            return {host: circuit.state for host, circuit in self._circuits.items()}
+
+    def before_request(self, host: str) -> None:
+        """Raises a CircuitBreakerOpenException if no request may be sent to host"""
+        with self._lock:
+            circuit = self._get_circuit(host)
+            self._update_state(circuit)
+            if circuit.state is CircuitBreakerState.OPEN:
+                raise CircuitBreakerOpenException(
+                    message=f"Circuit for {host} is open after {circuit.failures} failures"
+                )
+            if circuit.state is CircuitBreakerState.HALF_OPEN:
+                if circuit.probes >= self.half_open_max_calls:
+                    raise CircuitBreakerOpenException(
+                        message=f"Circuit for {host} is half-open, probe in progress"
+                    )
+                circuit.probes += 1
+
+    def release(self, host: str) -> None:
+        """
+        Releases the probe slot of a request that ended without an outcome,
+        e.g. because of an exception that says nothing about the host
+        """
+        with self._lock:
+            circuit = self._get_circuit(host)
+            if circuit.state is CircuitBreakerState.HALF_OPEN and circuit.probes > 0:
+                circuit.probes -= 1
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            circuit = self._get_circuit(host)
+            circuit.state = CircuitBreakerState.CLOSED
+            circuit.failures = 0
+            circuit.probes = 0
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            circuit = self._get_circuit(host)
+            circuit.failures += 1
+            if (
+                circuit.state is CircuitBreakerState.HALF_OPEN
+                or circuit.failures >= self.failure_threshold
+            ):
+                self._open(circuit)
+
+    def record_response(self, host: str, status_code: Optional[int]) -> None:
+        """Records the outcome of a request, None if no response was received"""
+        if status_code is None or status_code in self.failure_status_codes:
+            self.record_failure(host)
+        else:
+            self.record_success(host)
+
+    def reset(self, host: Optional[str] = None) -> None:
+        with self._lock:
+            if host is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(host, None)
@@ -1,23 +1,72 @@
 import functools
 import logging
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Iterable, Iterator, Optional, Union
+from urllib.parse import urljoin, urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
+from onerecord import codec
+from onerecord.cache import LogisticsObjectCache
+from onerecord.circuitbreaker import CircuitBreaker
+from onerecord.coalescing import PatchCoalescer
 from onerecord.exceptions import ONERecordClientException
 from onerecord.models.api import Notification, PatchRequest
 from onerecord.models.cargo import Event, LogisticsObject
 from onerecord.models.enums import LogisticsObjectType
+from onerecord.ratelimit import RateLimiter
+from onerecord.retry import RetryPolicy
 from onerecord.utils import (
+    LazyThing,
+    dict_to_logistics_object,
     generate_patch_request,
+    iter_json_to_logistics_objects,
     json_to_events,
+    json_to_lazy_logistics_objects,
     json_to_logistics_object,
     json_to_logistics_objects,
+    thing_to_json,
 )
 
 logger = logging.getLogger("onerecord-client")
 
 
+class _PoolStatsMixin:
+    """Counts opened and reused connections of an urllib3 connection pool"""
+
+    num_connections_opened: int = 0
+    num_connections_reused: int = 0
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)
+        if getattr(conn, "sock", None) is None:
+            self.num_connections_opened += 1
+        else:
+            self.num_connections_reused += 1
+        return conn
+
+
+class _PoolStatsHTTPConnectionPool(_PoolStatsMixin, HTTPConnectionPool):
+    pass
+
+
+class _PoolStatsHTTPSConnectionPool(_PoolStatsMixin, HTTPSConnectionPool):
+    pass
+
+
+class _PoolStatsHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools keep connection statistics"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _PoolStatsHTTPConnectionPool,
+            "https": _PoolStatsHTTPSConnectionPool,
+        }
+
+
 class ONERecordClient:
     """
     ONERecordClient object to interact with an ONE Record API.
@@ -38,8 +87,50 @@ class ONERecordClient:
         cert=None,
         session=None,
         headers=None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        cache: Optional[LogisticsObjectCache] = None,
+        track_baseline: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        validate_responses: bool = True,
+        compact_json_ld: bool = False,
+        coalesce_window: Optional[float] = None,
+        nested_patch_paths: bool = False,
     ):
-        """Construct a new ONERecordClient object."""
+        """
+        Construct a new ONERecordClient object.
+
+        pool_connections is the number of hosts to keep connection pools for,
+        pool_maxsize the maximum number of connections kept per host.
+        With pool_block the client waits for a free connection instead of
+        opening additional throwaway connections once pool_maxsize is reached.
+        keep_alive=False closes every connection after its response.
+        The pool options apply only if no session is provided.
+        With a cache, get_logistics_object_by_uri revalidates previously
+        fetched objects with a conditional GET and reuses them on 304.
+        With track_baseline, LogisticsObjects returned by the client remember
+        the server state and revision they were read with, so that
+        update_logistics_object can compute the changes without a GET.
+        A retry_policy retries failed GET requests and, if an idempotency key
+        is given, failed create_event and send_notification requests.
+        A rate_limiter delays requests to stay within the rate limits of the
+        partner hosts, it can be shared by several clients.
+        A circuit_breaker fails requests to a host fast with a
+        CircuitBreakerOpenException while the host keeps failing.
+        validate_responses=False skips pydantic validation of the responses,
+        only use it for trusted ONE Record servers.
+        compact_json_ld=True sends compact JSON-LD with a @context and short
+        keys, compact responses are always expanded.
+        With coalesce_window, updates of the same LogisticsObject within that
+        many seconds are merged into a single PATCH, see PatchCoalescer.
+        nested_patch_paths=True sends changes of nested objects as operations
+        on the deepest changed values with JSON pointer predicates, see
+        generate_patch_request, only use it if the server supports them.
+        """
         self._host = host
         self._port = int(port)
         if not company_identifier:
@@ -50,6 +141,13 @@ class ONERecordClient:
 
         if not session:
             session = requests.Session()
+            adapter = _PoolStatsHTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
 
         self._session = session
 
@@ -86,10 +184,26 @@ class ONERecordClient:
             headers = {}
         headers.setdefault("Content-Type", "application/ld+json")
         headers.setdefault("Accept", "application/ld+json")
+        if not keep_alive:
+            headers.setdefault("Connection", "close")
         self._headers = headers
 
         self._session.headers = self._headers
 
+        self._cache = cache
+        self._track_baseline = track_baseline
+        self._retry_policy = retry_policy
+        self._rate_limiter = rate_limiter
+        self._circuit_breaker = circuit_breaker
+        self._validate_responses = validate_responses
+        self._compact_json_ld = compact_json_ld
+        self._nested_patch_paths = nested_patch_paths
+        self._coalescer: Optional[PatchCoalescer] = (
+            PatchCoalescer(send=self.send_patch_request, window=coalesce_window)
+            if coalesce_window is not None
+            else None
+        )
+
         self._timeout = timeout
         if self._timeout:
             self._session.request = functools.partial(
@@ -97,24 +211,112 @@ class ONERecordClient:
             )
 
     def close(self):
+        if self._coalescer is not None:
+            self._coalescer.flush()
         self._session.close()
 
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a request through the session. Idempotent requests are
+        retried according to the retry policy of the client.
+        """
+        retry_policy: Optional[RetryPolicy] = self._retry_policy
+        if retry_policy is None or not retry_policy.is_idempotent(
+            method, kwargs.get("headers")
+        ):
+            return self._send(method, url, **kwargs)
+
+        attempt = 0
+        while True:
+            try:
+                response = self._send(method, url, **kwargs)
+            except requests.RequestException as e:
+                if not retry_policy.should_retry(attempt, exception=e):
+                    raise
+                backoff = retry_policy.get_backoff(attempt)
+                logger.info(f"{method} {url} failed ({e}), retry in {backoff:.2f}s")
+            else:
+                if not retry_policy.should_retry(attempt, response=response):
+                    return response
+                backoff = retry_policy.get_backoff(attempt, response=response)
+                logger.info(
+                    f"{method} {url} returned {response.status_code}, "
+                    f"retry in {backoff:.2f}s"
+                )
+                response.close()
+            retry_policy.sleep(backoff)
+            attempt += 1
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        circuit_breaker: Optional[CircuitBreaker] = self._circuit_breaker
+        host: str = urlsplit(url).netloc
+        if circuit_breaker is None:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(method, url)
+            return self._session.request(method, url, **kwargs)
+
+        circuit_breaker.before_request(host)
+        try:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(method, url)
+            response = self._session.request(method, url, **kwargs)
+        except requests.RequestException:
+            circuit_breaker.record_response(host, None)
+            raise
+        except BaseException:
+            # not an outcome of the host, but a half-open probe slot is taken
+            circuit_breaker.release(host)
+            raise
+        circuit_breaker.record_response(host, response.status_code)
+        return response
+
+    @staticmethod
+    def _idempotency_headers(idempotency_key: Optional[str]) -> Optional[dict]:
+        if idempotency_key is None:
+            return None
+        return {"Idempotency-Key": idempotency_key}
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Returns connection pool statistics per host, i.e. the number of
+        connections opened and the number of requests that reused
+        an already open connection
+        """
+        stats: dict[str, dict[str, int]] = {}
+        for adapter in set(self._session.adapters.values()):
+            pool_manager = getattr(adapter, "poolmanager", None)
+            if pool_manager is None:
+                continue
+            for pool_key in pool_manager.pools.keys():
+                pool = pool_manager.pools.get(pool_key)
+                if pool is None:
+                    continue
+                host = f"{pool.scheme}://{pool.host}:{pool.port}"
+                host_stats = stats.setdefault(host, {"opened": 0, "reused": 0})
+                host_stats["opened"] += getattr(
+                    pool, "num_connections_opened", pool.num_connections
+                )
+                host_stats["reused"] += getattr(
+                    pool,
+                    "num_connections_reused",
+                    max(pool.num_requests - pool.num_connections, 0),
+                )
+        return stats
+
     def create_logistics_object(
         self, logistics_object: LogisticsObject
     ) -> LogisticsObject:
         """Creates a logistics object on a ONE Record API"""
         if type(logistics_object) not in LogisticsObject.__subclasses__():
             raise ValueError("No appropriate LogisticsObject provided")
-        data = logistics_object.json(exclude_none=True, by_alias=True)
-        logger.debug(f"Create LogicisObject: {data}")
+        data = thing_to_json(logistics_object, compact=self._compact_json_ld)
+        logger.debug(f"Create LogicisObject: {data.decode('utf-8')}")
         url = f"{self._baseurl}/los"
-        response = self._session.post(
-            url=url,
-            data=data,
-        )
+        response = self._request("POST", url=url, data=data)
 
         if response.status_code == 201 and "Location" in response.headers:
             logistics_object.id = response.headers["location"]
+            self._remember_baseline(logistics_object, response)
             return logistics_object
         else:
             raise ONERecordClientException(
@@ -122,68 +324,423 @@ class ONERecordClient:
                 code=response.status_code,
             )
 
+    def create_logistics_objects(
+        self, logistics_objects: Iterable[LogisticsObject], max_in_flight: int = 10
+    ) -> list[Union[LogisticsObject, Exception]]:
+        """
+        Creates many logistics objects on a ONE Record API in parallel,
+        with at most max_in_flight requests running at the same time.
+        Returns one result per input in the same order: either the created
+        LogisticsObject with its assigned @id or the exception that occurred.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        def create(
+            logistics_object: LogisticsObject,
+        ) -> Union[LogisticsObject, Exception]:
+            try:
+                return self.create_logistics_object(logistics_object=logistics_object)
+            except (
+                ONERecordClientException,
+                ValueError,
+                requests.RequestException,
+            ) as e:
+                logger.warning(f"Could not create LogisticsObject: {e}")
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            return list(executor.map(create, logistics_objects))
+
     def update_logistics_object(
         self, updated_logistics_object: LogisticsObject
     ) -> bool:
-        """Update a logistics object on a ONE Record API"""
+        """
+        Update a logistics object on a ONE Record API.
+        With track_baseline the changes are computed against the baseline
+        snapshot the object was read with. The current object is only
+        refetched if there is no baseline or the server rejects its revision.
+        With coalesce_window the update waits for the merged PATCH of all
+        updates of the object within the window, a rejected revision raises
+        an ONERecordClientException. Use submit_logistics_object_update to
+        not wait for it.
+        """
+        if self._coalescer is not None:
+            return self.submit_logistics_object_update(
+                updated_logistics_object
+            ).result()
         url: str = updated_logistics_object.id
+        baseline: Optional[LogisticsObject] = self._get_baseline(
+            updated_logistics_object
+        )
+        if baseline is not None:
+            try:
+                return self._patch_logistics_object(
+                    original_logistics_object=baseline,
+                    updated_logistics_object=updated_logistics_object,
+                )
+            except ONERecordClientException as e:
+                if e.code not in (409, 412):
+                    raise
+                logger.info(
+                    f"Revision of LogisticsObject[@id={url}] rejected, refetching"
+                )
+
         original_logistics_object: Optional[
             LogisticsObject
         ] = self.get_logistics_object_by_uri(url)
 
         if original_logistics_object:
-            patch_request: PatchRequest = generate_patch_request(
+            return self._patch_logistics_object(
                 original_logistics_object=original_logistics_object,
                 updated_logistics_object=updated_logistics_object,
-                requestor_company_identifier=self.company_identifier,
             )
-            if patch_request.operations is None or len(patch_request.operations) == 0:
-                raise ValueError("LogisticsObject seems to be up-to-date")
-            data = patch_request.json(exclude_none=True, by_alias=True)
-            logger.debug(f"Patch LogisticsObject with {data}")
-            response = self._session.patch(url=url, data=data)
-
-            if response.status_code == 204:
-                return True
-            elif response.status_code == 404:
-                raise ONERecordClientException(
-                    message=f'LogisticsObject[@id="{updated_logistics_object.id} not found"]',
-                    code=response.status_code,
-                )
-            else:
-                raise ONERecordClientException(
-                    message=f'Could not update LogisticsObject[@id="{updated_logistics_object.id}"]',
-                    code=response.status_code,
-                )
         else:
             logger.warning(f"LogisticsObject[@id={url}] not found")
         return False
 
+    def _patch_logistics_object(
+        self,
+        original_logistics_object: LogisticsObject,
+        updated_logistics_object: LogisticsObject,
+    ) -> bool:
+        patch_request: PatchRequest = generate_patch_request(
+            original_logistics_object=original_logistics_object,
+            updated_logistics_object=updated_logistics_object,
+            requestor_company_identifier=self.company_identifier,
+            nested_paths=self._nested_patch_paths,
+        )
+        if patch_request.operations is None or len(patch_request.operations) == 0:
+            raise ValueError("LogisticsObject seems to be up-to-date")
+        self.send_patch_request(patch_request)
+        self._patch_applied(updated_logistics_object, patch_request)
+        return True
+
+    def _patch_applied(
+        self, updated_logistics_object: LogisticsObject, patch_request: PatchRequest
+    ) -> None:
+        if self._track_baseline:
+            updated_logistics_object._revision = int(patch_request.revision) + 1
+            self._remember_baseline(updated_logistics_object)
+
+    def _get_baseline(
+        self, logistics_object: LogisticsObject
+    ) -> Optional[LogisticsObject]:
+        if not self._track_baseline:
+            return None
+        return getattr(logistics_object, "_baseline", None)
+
+    def submit_logistics_object_update(
+        self, updated_logistics_object: LogisticsObject
+    ) -> Future:
+        """
+        Like update_logistics_object, but returns a Future of the result
+        instead of waiting for it. With coalesce_window, further updates of
+        the object or of other copies of the same LogisticsObject within the
+        window are merged into the same PATCH, e.g. several changes of an
+        event handler. A later update of the same object replaces the
+        earlier one, since both are diffed against the same baseline.
+        Without coalesce_window the update is sent right away.
+        """
+        future: Future = Future()
+        if self._coalescer is None:
+            try:
+                future.set_result(
+                    self.update_logistics_object(updated_logistics_object)
+                )
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        url: str = updated_logistics_object.id
+        original_logistics_object: Optional[LogisticsObject] = self._get_baseline(
+            updated_logistics_object
+        )
+        if original_logistics_object is None:
+            original_logistics_object = self.get_logistics_object_by_uri(url)
+            if original_logistics_object is None:
+                logger.warning(f"LogisticsObject[@id={url}] not found")
+                future.set_result(False)
+                return future
+        patch_request: PatchRequest = generate_patch_request(
+            original_logistics_object=original_logistics_object,
+            updated_logistics_object=updated_logistics_object,
+            requestor_company_identifier=self.company_identifier,
+            nested_paths=self._nested_patch_paths,
+        )
+        if patch_request.operations is None or len(patch_request.operations) == 0:
+            future.set_exception(ValueError("LogisticsObject seems to be up-to-date"))
+            return future
+        return self.submit_patch_request(
+            patch_request,
+            key=id(updated_logistics_object),
+            on_success=functools.partial(self._patch_applied, updated_logistics_object),
+        )
+
+    def submit_patch_request(
+        self,
+        patch_request: PatchRequest,
+        key: Optional[Hashable] = None,
+        on_success: Optional[Callable[[PatchRequest], None]] = None,
+    ) -> Future:
+        """
+        Buffers a PatchRequest for coalesce_window seconds and returns a
+        Future of the result of the merged PATCH, see PatchCoalescer.submit.
+        Without coalesce_window the PatchRequest is sent right away.
+        """
+        if self._coalescer is not None:
+            return self._coalescer.submit(patch_request, key=key, on_success=on_success)
+        future: Future = Future()
+        try:
+            future.set_result(self.send_patch_request(patch_request))
+            if on_success is not None:
+                on_success(patch_request)
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def flush_patch_requests(self) -> None:
+        """Sends all buffered PatchRequests now"""
+        if self._coalescer is not None:
+            self._coalescer.flush()
+
+    def send_patch_request(self, patch_request: PatchRequest) -> bool:
+        """Sends a PatchRequest to the LogisticsObject it references"""
+        url: str = patch_request.logistics_object_ref.logistics_object_id
+        data = thing_to_json(patch_request, compact=self._compact_json_ld)
+        logger.debug(f"Patch LogisticsObject with {data.decode('utf-8')}")
+        response = self._request("PATCH", url=url, data=data)
+        if self._cache is not None:
+            self._cache.invalidate(url)
+
+        if response.status_code == 204:
+            return True
+        elif response.status_code == 404:
+            raise ONERecordClientException(
+                message=f'LogisticsObject[@id="{url} not found"]',
+                code=response.status_code,
+            )
+        else:
+            raise ONERecordClientException(
+                message=f'Could not update LogisticsObject[@id="{url}"]',
+                code=response.status_code,
+            )
+
+    def _remember_baseline(
+        self,
+        logistics_object: Optional[LogisticsObject],
+        response: Optional[requests.Response] = None,
+    ) -> None:
+        """Stores a snapshot of the server state on a LogisticsObject"""
+        if not self._track_baseline or logistics_object is None:
+            return
+        if response is not None and "Latest-Revision" in response.headers:
+            logistics_object._revision = int(response.headers["Latest-Revision"])
+        logistics_object._baseline = None
+        logistics_object._baseline = logistics_object.copy(deep=True)
+        if logistics_object.changed_fields() is not None:
+            # changes are relative to the new baseline from now on
+            logistics_object.track_changes()
+
     def get_logistics_objects(
-        self, logistics_object_type: LogisticsObjectType = None
+        self,
+        logistics_object_type: LogisticsObjectType = None,
+        max_workers: Optional[int] = None,
     ) -> list[LogisticsObject]:
-        """Returns a list of logistics objects from a ONE Record API"""
+        """
+        Returns a list of logistics objects from a ONE Record API.
+        With max_workers the objects are built in a process pool.
+        """
+        response = self._get_logistics_objects_response(logistics_object_type)
+        logistics_objects: list[LogisticsObject] = json_to_logistics_objects(
+            logistics_objects_json=response.content,
+            validate=self._validate_responses,
+            max_workers=max_workers,
+        )
+        for logistics_object in logistics_objects:
+            self._remember_baseline(logistics_object)
+        return logistics_objects
+
+    def get_lazy_logistics_objects(
+        self, logistics_object_type: LogisticsObjectType = None
+    ) -> list[LazyThing]:
+        """
+        Returns a list of LazyThing proxies of the logistics objects from a
+        ONE Record API that only validate the fields that are read, e.g. for
+        overviews of many objects.
+        """
+        response = self._get_logistics_objects_response(logistics_object_type)
+        return json_to_lazy_logistics_objects(logistics_objects_json=response.content)
+
+    def _get_logistics_objects_response(
+        self, logistics_object_type: Optional[LogisticsObjectType]
+    ) -> requests.Response:
         url = f"{self._baseurl}/los"
         if logistics_object_type:
             url = f"{url}?type={logistics_object_type.value}"
         logger.debug(f"Get LogicisObjects from {url}")
-        response = self._session.get(url)
-        if response.status_code == 200:
-            return json_to_logistics_objects(logistics_objects_json=response.text)
-        else:
+        response = self._request("GET", url=url)
+        if response.status_code != 200:
             raise ONERecordClientException(
                 message="Could not get LogisticsObject",
                 code=response.status_code,
             )
+        return response
+
+    def iter_logistics_objects(
+        self,
+        logistics_object_type: LogisticsObjectType = None,
+        chunk_size: int = 65536,
+    ) -> Iterator[LogisticsObject]:
+        """
+        Returns an iterator over the logistics objects from a ONE Record API.
+        The response is streamed and parsed incrementally, so that only one
+        logistics object at a time is held in memory.
+        """
+        url = f"{self._baseurl}/los"
+        if logistics_object_type:
+            url = f"{url}?type={logistics_object_type.value}"
+        logger.debug(f"Stream LogicisObjects from {url}")
+        response = self._request("GET", url=url, stream=True)
+        with response:
+            if response.status_code != 200:
+                raise ONERecordClientException(
+                    message="Could not get LogisticsObject",
+                    code=response.status_code,
+                )
+            for logistics_object in iter_json_to_logistics_objects(
+                response.iter_content(chunk_size=chunk_size),
+                validate=self._validate_responses,
+            ):
+                self._remember_baseline(logistics_object)
+                yield logistics_object
+
+    def iter_logistics_object_pages(
+        self,
+        logistics_object_type: LogisticsObjectType = None,
+        limit: int = 100,
+        prefetch: bool = True,
+    ) -> Iterator[list[LogisticsObject]]:
+        """
+        Returns a lazy iterator over pages of logistics objects from a
+        ONE Record API. Pages are requested with limit and offset query
+        parameters, a next link in the Link header of a response takes
+        precedence. With prefetch the next page is already requested in the
+        background while the caller processes the current one.
+        Paging stops at a short page or at a page with the same @ids as the
+        previous one, e.g. from a server that ignores limit and offset.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        url = f"{self._baseurl}/los"
+        params: dict = {"limit": limit, "offset": 0}
+        if logistics_object_type:
+            params["type"] = logistics_object_type.value
+
+        def fetch(
+            page_url: str,
+            page_params: Optional[dict],
+            previous_ids: Optional[list] = None,
+        ) -> tuple[list[LogisticsObject], Optional[tuple]]:
+            logger.debug(f"Get LogicisObjects from {page_url} {page_params or ''}")
+            response = self._request("GET", url=page_url, params=page_params)
+            if response.status_code != 200:
+                raise ONERecordClientException(
+                    message="Could not get LogisticsObject",
+                    code=response.status_code,
+                )
+            logistics_objects_list: list = codec.loads(response.content)
+            ids: list = [
+                logistics_object_dict.get("@id")
+                for logistics_object_dict in logistics_objects_list
+                if isinstance(logistics_object_dict, dict)
+            ]
+            if logistics_objects_list and ids == previous_ids:
+                logger.warning(
+                    f"{page_url} {page_params or ''} returned the previous page again"
+                )
+                return [], None
+            page: list[LogisticsObject] = []
+            for logistics_object_dict in logistics_objects_list:
+                logistics_object = dict_to_logistics_object(
+                    logistics_object_dict=logistics_object_dict,
+                    validate=self._validate_responses,
+                )
+                if logistics_object:
+                    self._remember_baseline(logistics_object)
+                    page.append(logistics_object)
+
+            next_request: Optional[tuple] = None
+            if logistics_objects_list and "next" in response.links:
+                next_request = (
+                    urljoin(page_url, response.links["next"]["url"]),
+                    None,
+                    ids,
+                )
+            elif page_params is not None and len(logistics_objects_list) == limit:
+                next_request = (
+                    page_url,
+                    {**page_params, "offset": page_params["offset"] + limit},
+                    ids,
+                )
+            return page, next_request
+
+        if not prefetch:
+            next_request: Optional[tuple] = (url, params)
+            while next_request is not None:
+                page, next_request = fetch(*next_request)
+                if page:
+                    yield page
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future: Optional[Future] = executor.submit(fetch, url, params)
+            while future is not None:
+                page, next_request = future.result()
+                future = executor.submit(fetch, *next_request) if next_request else None
+                if page:
+                    yield page
 
     def get_logistics_object_by_uri(self, uri: str) -> Optional[LogisticsObject]:
         """Returns a logistics object by URI"""
         logger.debug(f"Get LogicisObject from {uri}")
-        response = self._session.get(uri)
-        if response.status_code == 200:
-            return json_to_logistics_object(logistics_object_json=response.text)
+        cache_entry = self._cache.get(uri) if self._cache is not None else None
+        headers = {}
+        if cache_entry is not None:
+            if cache_entry.etag:
+                headers["If-None-Match"] = cache_entry.etag
+            if cache_entry.last_modified:
+                headers["If-Modified-Since"] = cache_entry.last_modified
+        response = self._request("GET", url=uri, headers=headers)
+        logistics_object: Optional[LogisticsObject]
+        if response.status_code == 304 and cache_entry is not None:
+            logger.debug(f"LogisticsObject[@id={uri}] not modified, using cache")
+            logistics_object = cache_entry.logistics_object.copy(deep=True)
+            self._remember_baseline(logistics_object, response)
+            return logistics_object
+
+        elif response.status_code == 200:
+            logistics_object = json_to_logistics_object(
+                logistics_object_json=response.content,
+                validate=self._validate_responses,
+            )
+            if self._cache is not None and logistics_object is not None:
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    self._cache.put(
+                        uri,
+                        logistics_object.copy(deep=True),
+                        etag=etag,
+                        last_modified=last_modified,
+                    )
+                else:
+                    self._cache.invalidate(uri)
+            self._remember_baseline(logistics_object, response)
+            return logistics_object
 
         elif response.status_code == 404:
+            if self._cache is not None:
+                self._cache.invalidate(uri)
             raise ONERecordClientException(
                 message="LogisticsObject does not exist",
                 code=response.status_code,
@@ -194,12 +751,23 @@ class ONERecordClient:
                 code=response.status_code,
             )
 
-    def create_event(self, logistics_object_uri: str, event: Event) -> Optional[bool]:
-        """Creates Events object for particular LogisticsObject"""
+    def create_event(
+        self,
+        logistics_object_uri: str,
+        event: Event,
+        idempotency_key: Optional[str] = None,
+    ) -> Optional[bool]:
+        """
+        Creates Events object for particular LogisticsObject.
+        Failed requests are only retried if an idempotency_key is given.
+        """
         logger.debug(f"Create Event for LogisticsObject[@id={logistics_object_uri}]")
         url = f"{logistics_object_uri}/events"
-        response = self._session.post(
-            url=url, data=event.json(exclude_none=True, by_alias=True)
+        response = self._request(
+            "POST",
+            url=url,
+            data=thing_to_json(event, compact=self._compact_json_ld),
+            headers=self._idempotency_headers(idempotency_key),
         )
 
         if response.status_code == 201:
@@ -218,10 +786,12 @@ class ONERecordClient:
         self, logistics_object_uri: str
     ) -> list[Event]:
         url = f"{logistics_object_uri}/events"
-        response = self._session.get(url=url)
+        response = self._request("GET", url=url)
         logger.debug(f"Get Events for LogisticsObject[@id={logistics_object_uri}]")
         if response.status_code == 200:
-            return json_to_events(events_json=response.text)
+            return json_to_events(
+                events_json=response.content, validate=self._validate_responses
+            )
         else:
             raise ONERecordClientException(
                 message=f'Could not get Events for LogisticsObject[@id="{logistics_object_uri}"]',
@@ -229,13 +799,24 @@ class ONERecordClient:
             )
 
     def send_notification(
-        self, callback_url: str, notification: Notification
+        self,
+        callback_url: str,
+        notification: Notification,
+        idempotency_key: Optional[str] = None,
     ) -> Optional[bool]:
-        data = notification.json(exclude_none=True, by_alias=True)
-        logger.debug(f"Send Notification to {callback_url}. Data: {data}")
-        response = self._session.post(
+        """
+        Sends a Notification to a callback URL.
+        Failed requests are only retried if an idempotency_key is given.
+        """
+        data = thing_to_json(notification, compact=self._compact_json_ld)
+        logger.debug(
+            f"Send Notification to {callback_url}. Data: {data.decode('utf-8')}"
+        )
+        response = self._request(
+            "POST",
             url=callback_url,
             data=data,
+            headers=self._idempotency_headers(idempotency_key),
         )
         if response.status_code == 200:
             return True
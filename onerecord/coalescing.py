@@ -0,0 +1,128 @@
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable, Optional
+
+from onerecord.models.api import PatchRequest
+from onerecord.utils import merge_patch_requests
+
+logger = logging.getLogger("onerecord-client")
+
+
+class _PendingPatchRequests:
+    def __init__(self, timer: threading.Timer):
+        self.timer = timer
+        # keyed by the submitter, a later PatchRequest of the same key replaces
+        # the earlier one, e.g. a new diff of the same updated object
+        self.patch_requests: dict[Hashable, PatchRequest] = {}
+        self.callbacks: dict[Hashable, Callable[[PatchRequest], None]] = {}
+        self.futures: dict[Hashable, list[Future]] = {}
+
+
+class PatchCoalescer:
+    """
+    Buffers PatchRequests per LogisticsObject @id for window seconds,
+    merges them with merge_patch_requests and sends them with a single
+    call of send, e.g. ONERecordClient.send_patch_request.
+    Every submitter gets a Future that resolves to the result of that call.
+    PatchRequests that set different values of the same single-valued
+    property cannot be merged and are sent one after the other instead.
+    """
+
+    def __init__(self, send: Callable[[PatchRequest], bool], window: float = 0.05):
+        if window < 0:
+            raise ValueError("window must not be negative")
+        self.window = window
+        self._send = send
+        self._pending: dict[str, _PendingPatchRequests] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        patch_request: PatchRequest,
+        key: Optional[Hashable] = None,
+        on_success: Optional[Callable[[PatchRequest], None]] = None,
+    ) -> Future:
+        """
+        Buffers a PatchRequest and returns a Future of the result of the
+        merged PATCH. A PatchRequest with the same key as a buffered one
+        replaces it. on_success is called with the sent PatchRequest.
+        """
+        logistics_object_id: str = (
+            patch_request.logistics_object_ref.logistics_object_id
+        )
+        if key is None:
+            key = object()
+        future: Future = Future()
+        with self._lock:
+            pending = self._pending.get(logistics_object_id)
+            if pending is None:
+                timer = threading.Timer(
+                    self.window, self.flush, args=(logistics_object_id,)
+                )
+                timer.daemon = True
+                pending = _PendingPatchRequests(timer)
+                self._pending[logistics_object_id] = pending
+                timer.start()
+            pending.patch_requests.pop(key, None)
+            pending.patch_requests[key] = patch_request
+            if on_success is not None:
+                pending.callbacks[key] = on_success
+            pending.futures.setdefault(key, []).append(future)
+        return future
+
+    def flush(self, logistics_object_id: Optional[str] = None) -> None:
+        """Sends the buffered PatchRequests of one or all LogisticsObjects now"""
+        with self._lock:
+            if logistics_object_id is None:
+                pending_list = list(self._pending.values())
+                self._pending.clear()
+            else:
+                pending = self._pending.pop(logistics_object_id, None)
+                pending_list = [pending] if pending is not None else []
+        for pending in pending_list:
+            pending.timer.cancel()
+            self._send_pending(pending)
+
+    def _send_pending(self, pending: _PendingPatchRequests) -> None:
+        keys: list[Hashable] = list(pending.patch_requests)
+        try:
+            patch_request = merge_patch_requests(
+                [pending.patch_requests[key] for key in keys]
+            )
+        except ValueError as e:
+            # different values for the same property, sent one after the
+            # other so that the server decides which of them applies
+            logger.debug(f"Sending {len(keys)} updates separately: {e}")
+            for key in keys:
+                self._send_patch_request(pending, [key], pending.patch_requests[key])
+            return
+        logger.debug(
+            f"Coalesced {len(keys)} updates of "
+            f"{patch_request.logistics_object_ref.logistics_object_id}"
+        )
+        self._send_patch_request(pending, keys, patch_request)
+
+    def _send_patch_request(
+        self,
+        pending: _PendingPatchRequests,
+        keys: list[Hashable],
+        patch_request: PatchRequest,
+    ) -> None:
+        futures: list[Future] = [f for key in keys for f in pending.futures[key]]
+        try:
+            if patch_request.operations:
+                result = self._send(patch_request)
+                for key in keys:
+                    callback = pending.callbacks.get(key)
+                    if callback is not None:
+                        callback(patch_request)
+            else:
+                # all changes cancelled each other out
+                result = True
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+        else:
+            for future in futures:
+                future.set_result(result)
@@ -0,0 +1,88 @@
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+# JSON documents can be passed as text, bytes or any bytes-like buffer
+JSONInput = Union[bytes, bytearray, memoryview, str]
+
+
+class JSONCodec:
+    """JSON codec based on the json module of the standard library"""
+
+    name: str = "json"
+
+    def loads(self, data: JSONInput) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(self, obj: Any, default: Optional[Callable] = None) -> bytes:
+        return json.dumps(obj, default=default).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec based on orjson, used by default if orjson is installed"""
+
+    name: str = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    def loads(self, data: JSONInput) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any, default: Optional[Callable] = None) -> bytes:
+        # datetimes are passed to default to keep the format of the models
+        return orjson.dumps(
+            obj, default=default, option=orjson.OPT_PASSTHROUGH_DATETIME
+        )
+
+
+_codec: JSONCodec = OrjsonCodec() if orjson is not None else JSONCodec()
+
+
+def get_codec() -> JSONCodec:
+    """Returns the JSON codec used by the client, utils and models"""
+    return _codec
+
+
+def set_codec(codec: Union[JSONCodec, str]) -> None:
+    """Sets the JSON codec used by the client, utils and models, e.g. 'json' or 'orjson'"""
+    global _codec
+    if isinstance(codec, str):
+        codecs: dict[str, type] = {
+            JSONCodec.name: JSONCodec,
+            OrjsonCodec.name: OrjsonCodec,
+        }
+        if codec not in codecs:
+            raise ValueError(f"Unknown JSON codec {codec}")
+        _codec = codecs[codec]()
+    else:
+        _codec = codec
+
+
+def loads(data: JSONInput) -> Any:
+    return _codec.loads(data)
+
+
+def dumps(obj: Any, default: Optional[Callable] = None) -> bytes:
+    return _codec.dumps(obj, default=default)
+
+
+def pydantic_json_loads(data: JSONInput) -> Any:
+    """json_loads for the pydantic config of the models"""
+    return _codec.loads(data)
+
+
+def pydantic_json_dumps(
+    obj: Any, *, default: Optional[Callable] = None, **dumps_kwargs
+) -> str:
+    """json_dumps for the pydantic config of the models"""
+    if dumps_kwargs:
+        return json.dumps(obj, default=default, **dumps_kwargs)
+    return _codec.dumps(obj, default=default).decode("utf-8")
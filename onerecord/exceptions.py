@@ -11,3 +11,7 @@ class ONERecordClientException(Exception):
         super().__init__(message)
         self.message = message
         self.code = code
+
+
+class CircuitBreakerOpenException(ONERecordClientException):
+    """Raised when a request is rejected because the circuit of its host is open."""
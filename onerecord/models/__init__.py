@@ -1,19 +1,293 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import TYPE_CHECKING, Any, Iterable, Optional, SupportsIndex, TypeVar, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from pydantic.utils import to_camel
 
+from onerecord.codec import pydantic_json_dumps, pydantic_json_loads
+
+if TYPE_CHECKING:
+    from pydantic.typing import AbstractSetIntStr, DictStrAny, MappingIntStrAny
+
 """
 Generated: 2022-10-11
 """
 
 
+class _ParentLink:
+    """Link of a nested Thing or list to the field of its parent Thing"""
+
+    __slots__ = ("parent", "field_name")
+
+    def __init__(self, parent: Thing, field_name: str):
+        self.parent = parent
+        self.field_name = field_name
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, _ParentLink)
+            and other.parent is self.parent
+            and other.field_name == self.field_name
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.parent), self.field_name))
+
+    def __copy__(self) -> _ParentLink:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Optional[_ParentLink]:
+        # link to the copy of the parent, a copy without its parent is unlinked
+        parent: Optional[Thing] = memo.get(id(self.parent))
+        if parent is None:
+            return None
+        return _ParentLink(parent, self.field_name)
+
+    def record_change(self) -> None:
+        self.parent._record_change(self.field_name)
+
+
+def _add_link(links: tuple, link: Optional[_ParentLink]) -> tuple:
+    if link is None or link in links:
+        return links
+    return links + (link,)
+
+
+def _copy_tracked(value: Any) -> Any:
+    """Copies the lists and nested Things of a value that a Thing would link"""
+    if isinstance(value, Thing):
+        return value.copy()
+    if isinstance(value, list):
+        return TrackedList(_copy_tracked(element) for element in value)
+    return value
+
+
+def _link(value: Any, link: _ParentLink) -> None:
+    """Links nested Things and lists of a value to the field of a parent Thing"""
+    if isinstance(value, Thing):
+        value._start_tracking(link)
+    elif isinstance(value, list):
+        if isinstance(value, TrackedList):
+            value._links = _add_link(value._links, link)
+        for element in value:
+            _link(element, link)
+
+
+def _unlink(value: Any, link: _ParentLink) -> None:
+    """Removes the link of a value that is no longer in the field of a parent Thing"""
+    if isinstance(value, Thing):
+        value._parent_links = tuple(li for li in value._parent_links if li != link)
+    elif isinstance(value, list):
+        if isinstance(value, TrackedList):
+            value._links = tuple(li for li in value._links if li != link)
+        for element in value:
+            _unlink(element, link)
+
+
+def _has_untracked_list(value: Any) -> bool:
+    """Returns True if a plain list, which cannot record mutations, is in a value"""
+    if isinstance(value, Thing):
+        return any(
+            _has_untracked_list(value.__dict__.get(name)) for name in value.__fields__
+        )
+    if isinstance(value, list):
+        return not isinstance(value, TrackedList) or any(
+            _has_untracked_list(element) for element in value
+        )
+    return False
+
+
+class TrackedList(list):
+    """list of a Thing field that records mutations once change tracking is on"""
+
+    __slots__ = ("_links",)
+
+    def __init__(self, iterable: Iterable = ()):
+        super().__init__(iterable)
+        self._links: tuple[_ParentLink, ...] = ()
+
+    def __reduce_ex__(self, protocol: SupportsIndex):
+        return TrackedList, (list(self),)
+
+    def _changed(self, values: Iterable = ()) -> None:
+        for link in self._links:
+            for value in values:
+                _link(value, link)
+            link.record_change()
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._changed(value if isinstance(index, slice) else [value])
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, values: Iterable) -> TrackedList:  # type: ignore[misc]
+        values = list(values)
+        super().__iadd__(values)
+        self._changed(values)
+        return self
+
+    def __imul__(self, n: SupportsIndex) -> TrackedList:
+        super().__imul__(n)
+        self._changed()
+        return self
+
+    def append(self, value: Any) -> None:
+        super().append(value)
+        self._changed([value])
+
+    def extend(self, values: Iterable) -> None:
+        values = list(values)
+        super().extend(values)
+        self._changed(values)
+
+    def insert(self, index: SupportsIndex, value: Any) -> None:
+        super().insert(index, value)
+        self._changed([value])
+
+    def pop(self, index: SupportsIndex = -1) -> Any:
+        value = super().pop(index)
+        self._changed()
+        return value
+
+    def remove(self, value: Any) -> None:
+        super().remove(value)
+        self._changed()
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._changed()
+
+
+ThingT = TypeVar("ThingT", bound="Thing")
+
+
 class Thing(BaseModel):
     id: str = Field(default=None, alias="@id")
 
+    # opt-in change tracking, not part of the ontology
+    _changed_fields: Optional[set] = PrivateAttr(default=None)
+    _parent_links: tuple[_ParentLink, ...] = PrivateAttr(default=())
+
     class Config:
         allow_population_by_field_name = True
         alias_generator = to_camel
         json_encoders = {datetime: lambda v: v.strftime("%Y-%m-%dT%H:%M:%SZ")}
+        json_loads = pydantic_json_loads
+        json_dumps = pydantic_json_dumps
+
+    def __init__(__pydantic_self__, **data: Any) -> None:
+        super().__init__(**data)
+        __pydantic_self__._track_lists()
+
+    @classmethod
+    def construct(
+        cls: type[ThingT], _fields_set: Optional[set[str]] = None, **values: Any
+    ) -> ThingT:
+        thing = super().construct(_fields_set, **values)
+        thing._track_lists()
+        return thing
+
+    def track_changes(self) -> None:
+        """
+        Starts recording which fields of this Thing are changed from now on,
+        by assignment or by modifying lists and nested Things in place.
+        Calling it again clears the recorded changes.
+        A plain list assigned to a field counts as changed as long as it is
+        there, since it cannot record its mutations.
+        """
+        self._start_tracking(None)
+        self._changed_fields = set()
+
+    def changed_fields(self) -> Optional[set[str]]:
+        """Returns the names of the changed fields, None if changes are not tracked"""
+        if self._changed_fields is None:
+            return None
+        changed_fields: set[str] = set(self._changed_fields)
+        for name in self.__fields__:
+            if name not in changed_fields and _has_untracked_list(
+                self.__dict__.get(name)
+            ):
+                changed_fields.add(name)
+        return changed_fields
+
+    def _track_lists(self) -> None:
+        # lists of the fields record their mutations in place, so that
+        # references to them stay valid once change tracking starts
+        for name in self.__fields__:
+            value = self.__dict__.get(name)
+            if type(value) is list:
+                self.__dict__[name] = TrackedList(value)
+
+    def _start_tracking(self, parent_link: Optional[_ParentLink]) -> None:
+        self._parent_links = _add_link(self._parent_links, parent_link)
+        for name in self.__fields__:
+            value = self.__dict__.get(name)
+            if isinstance(value, (Thing, list)):
+                _link(value, _ParentLink(self, name))
+
+    def _is_tracking(self) -> bool:
+        return self._changed_fields is not None or bool(self._parent_links)
+
+    def _record_change(self, name: str) -> None:
+        if self._changed_fields is not None:
+            self._changed_fields.add(name)
+        for parent_link in self._parent_links:
+            parent_link.record_change()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in self.__fields__ or not self._is_tracking():
+            super().__setattr__(name, value)
+            return
+        link = _ParentLink(self, name)
+        _unlink(self.__dict__.get(name), link)
+        super().__setattr__(name, value)
+        _link(self.__dict__[name], link)
+        self._record_change(name)
+
+    def __copy__(self: ThingT) -> ThingT:
+        # the default copy would share __dict__ and the links with this Thing
+        return self.copy()
+
+    def __setstate__(self, state: Any) -> None:
+        super().__setstate__(state)
+        self._track_lists()
+        # deep copies drop the links to parents that were not copied
+        self._parent_links = tuple(li for li in self._parent_links if li is not None)
+        if self._is_tracking():
+            self._start_tracking(None)
+
+    def copy(
+        self: ThingT,
+        *,
+        include: Optional[Union[AbstractSetIntStr, MappingIntStrAny]] = None,
+        exclude: Optional[Union[AbstractSetIntStr, MappingIntStrAny]] = None,
+        update: Optional[DictStrAny] = None,
+        deep: bool = False,
+    ) -> ThingT:
+        thing = super().copy(include=include, exclude=exclude, update=update, deep=deep)
+        thing._parent_links = ()
+        if self._is_tracking():
+            if not deep:
+                # a shallow copy must not share what the copy links to itself
+                for name in thing.__fields__:
+                    if update is None or name not in update:
+                        value = thing.__dict__.get(name)
+                        thing.__dict__[name] = _copy_tracked(value)
+            # the copy tracks its own fields, including the updated ones
+            changed_fields: set = set(self._changed_fields or ()) | set(update or ())
+            thing._start_tracking(None)
+            thing._changed_fields = changed_fields
+        return thing
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
+from typing import Optional
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from onerecord.models import Thing
 from onerecord.models.enums import (
@@ -540,6 +541,10 @@ class LogisticsObject(Thing):
         description="Allows to link Logistic Objects with IoT Devices",
     )
 
+    # server revision and baseline snapshot, not part of the ontology
+    _revision: Optional[int] = PrivateAttr(default=None)
+    _baseline: Optional["LogisticsObject"] = PrivateAttr(default=None)
+
 
 class Measurements(Thing):
     """
@@ -0,0 +1,119 @@
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that refills with rate tokens per second
+    up to capacity tokens. Callers reserve tokens and wait until their
+    reservation is covered, so that bursts are spread out evenly.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        if self.capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Takes tokens from the bucket and returns the seconds to wait for them"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Blocks until tokens are available and returns the seconds waited"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter for the ONERecordClient.
+    Every partner host gets its own token buckets. Limits can be set for
+    all hosts, a single host, a HTTP method or a HTTP method on a single host,
+    the most specific one wins. A RateLimiter can be shared across threads
+    and clients to enforce a common limit, e.g. per company_identifier.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._clock = clock
+        self._sleep = sleep
+        self._limits: dict[tuple, tuple] = {}
+        self._buckets: dict[tuple, TokenBucket] = {}
+        self._lock = threading.Lock()
+        if rate is not None:
+            self.set_limit(rate=rate, capacity=capacity)
+
+    def set_limit(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        host: Optional[str] = None,
+        method: Optional[str] = None,
+    ) -> None:
+        """
+        Sets a limit of rate requests per second with bursts of up to
+        capacity requests, for a host (host:port) and/or HTTP method
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        key = (host, method.upper() if method else None)
+        with self._lock:
+            self._limits[key] = (rate, capacity)
+            for bucket_key in [k for k in self._buckets if k[0] == key]:
+                del self._buckets[bucket_key]
+
+    def _get_bucket(self, host: str, method: str) -> Optional[TokenBucket]:
+        for key in ((host, method), (host, None), (None, method), (None, None)):
+            if key in self._limits:
+                break
+        else:
+            return None
+        bucket_key = (key, host)
+        with self._lock:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                rate, capacity = self._limits[key]
+                bucket = TokenBucket(
+                    rate=rate, capacity=capacity, clock=self._clock, sleep=self._sleep
+                )
+                self._buckets[bucket_key] = bucket
+            return bucket
+
+    def acquire(self, method: str, url: str) -> float:
+        """Blocks until a request may be sent and returns the seconds waited"""
+        bucket = self._get_bucket(urlsplit(url).netloc, method.upper())
+        if bucket is None:
+            return 0.0
+        return bucket.acquire()
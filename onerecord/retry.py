@@ -0,0 +1,109 @@
+import email.utils
+import random
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import requests
+
+
+class RetryPolicy:
+    """
+    Retry policy for requests of the ONERecordClient.
+    Retries failed requests with exponential backoff and full jitter,
+    i.e. before retry n the client waits a random time between 0 and
+    min(max_backoff, backoff_factor * 2 ** n) seconds.
+    If a 429 or 503 response carries a Retry-After header, it is used instead,
+    a Retry-After longer than max_retry_after is not waited for and the
+    response is returned right away.
+    The client only applies the policy to idempotent requests: safe methods
+    and requests that carry an Idempotency-Key header.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+    RETRY_AFTER_STATUS_CODES = frozenset([429, 503])
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        status_codes: frozenset = frozenset([429, 500, 502, 503, 504]),
+        respect_retry_after: bool = True,
+        max_retry_after: float = 300.0,
+    ):
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_codes = status_codes
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def is_idempotent(self, method: str, headers: Optional[dict] = None) -> bool:
+        """Returns True if a request may be sent more than once"""
+        if method.upper() in self.IDEMPOTENT_METHODS:
+            return True
+        return headers is not None and "Idempotency-Key" in headers
+
+    def should_retry(
+        self,
+        attempt: int,
+        response: Optional[requests.Response] = None,
+        exception: Optional[Exception] = None,
+    ) -> bool:
+        """Returns True if the request should be sent again after the given attempt"""
+        if attempt >= self.max_retries:
+            return False
+        if exception is not None:
+            return isinstance(exception, (requests.ConnectionError, requests.Timeout))
+        if response is None or response.status_code not in self.status_codes:
+            return False
+        retry_after = self._get_retry_after(response)
+        return retry_after is None or retry_after <= self.max_retry_after
+
+    def get_backoff(
+        self, attempt: int, response: Optional[requests.Response] = None
+    ) -> float:
+        """Returns the number of seconds to wait before the next attempt"""
+        retry_after = self._get_retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        backoff = min(self.max_backoff, self.backoff_factor * (2**attempt))
+        if self.jitter:
+            return random.uniform(0, backoff)  # nosec: B311 not used for security
+        return backoff
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _get_retry_after(
+        self, response: Optional[requests.Response] = None
+    ) -> Optional[float]:
+        if (
+            self.respect_retry_after
+            and response is not None
+            and response.status_code in self.RETRY_AFTER_STATUS_CODES
+        ):
+            return self._parse_retry_after(response.headers.get("Retry-After"))
+        return None
+
+    @staticmethod
+    def _parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+        if not retry_after:
+            return None
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
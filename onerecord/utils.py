@@ -1,11 +1,22 @@
+import codecs
 import datetime
-import importlib
+import difflib
+import enum
+import functools
 import json
-from typing import Any, Optional
+import logging
+import operator
+import os
+import re
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
 
-from pydantic import PositiveInt
+from pydantic import PositiveInt, ValidationError
+from pydantic.datetime_parse import parse_datetime, parse_duration
+from pydantic.fields import SHAPE_SINGLETON, ModelField
 
-from onerecord.models import Thing
+from onerecord import codec
+from onerecord.models import Thing, ThingT, TrackedList, api, cargo
 from onerecord.models.api import (
     LogisticsObjectRef,
     Operation,
@@ -14,52 +25,33 @@ from onerecord.models.api import (
 )
 from onerecord.models.cargo import Event, LogisticsObject
 
-type_class_mapping: dict = {
-    "https://onerecord.iata.org/Booking": "Booking",
-    "https://onerecord.iata.org/BookingOption": "BookingOption",
-    "https://onerecord.iata.org/BookingOptionRequest": "BookingOptionRequest",
-    "https://onerecord.iata.org/BookingTimes": "BookingTimes",
-    "https://onerecord.iata.org/CO2CalcMethod": "CO2CalcMethod",
-    "https://onerecord.iata.org/CO2Emissions": "CO2Emissions",
-    "https://onerecord.iata.org/CarrierProduct": "CarrierProduct",
-    "https://onerecord.iata.org/Characteristics": "Characteristics",
-    "https://onerecord.iata.org/CustomsInfo": "CustomsInfo",
-    "https://onerecord.iata.org/DgDeclaration": "DgDeclaration",
-    "https://onerecord.iata.org/DgProductRadioactive": "DgProductRadioactive",
-    "https://onerecord.iata.org/DgRadioactiveIsotope": "DgRadioactiveIsotope",
-    "https://onerecord.iata.org/EpermitConsignment": "EpermitConsignment",
-    "https://onerecord.iata.org/EpermitSignature": "EpermitSignature",
-    "https://onerecord.iata.org/Insurance": "Insurance",
-    "https://onerecord.iata.org/IotDevice": "IotDevice",
-    "https://onerecord.iata.org/ItemDg": "ItemDg",
-    "https://onerecord.iata.org/Item": "Item",
-    "https://onerecord.iata.org/LiveAnimalsEpermit": "LiveAnimalsEpermit",
-    "https://onerecord.iata.org/PackagingType": "PackagingType",
-    "https://onerecord.iata.org/PieceDg": "PieceDg",
-    "https://onerecord.iata.org/PieceLiveAnimals": "PieceLiveAnimals",
-    "https://onerecord.iata.org/Piece": "Piece",
-    "https://onerecord.iata.org/Price": "Price",
-    "https://onerecord.iata.org/ProductDg": "ProductDg",
-    "https://onerecord.iata.org/Product": "Product",
-    "https://onerecord.iata.org/Ranges": "Ranges",
-    "https://onerecord.iata.org/Ratings": "Ratings",
-    "https://onerecord.iata.org/Request": "Request",
-    "https://onerecord.iata.org/Routing": "Routing",
-    "https://onerecord.iata.org/Schedule": "Schedule",
-    "https://onerecord.iata.org/SecurityDeclaration": "SecurityDeclaration",
-    "https://onerecord.iata.org/SensorGeoloc": "SensorGeoloc",
-    "https://onerecord.iata.org/SensorOther": "SensorOther",
-    "https://onerecord.iata.org/Sensor": "Sensor",
-    "https://onerecord.iata.org/ServiceRequest": "ServiceRequest",
-    "https://onerecord.iata.org/Shipment": "Shipment",
-    "https://onerecord.iata.org/SpecialHandling": "SpecialHandling",
-    "https://onerecord.iata.org/TransportMeans": "TransportMeans",
-    "https://onerecord.iata.org/TransportMovement": "TransportMovement",
-    "https://onerecord.iata.org/TransportSegment": "TransportSegment",
-    "https://onerecord.iata.org/ULD": "ULD",
-    "https://onerecord.iata.org/Value": "Value",
-    "https://onerecord.iata.org/Waybill": "Waybill",
+logger = logging.getLogger("onerecord-client")
+
+
+def _build_type_class_index() -> dict[str, type]:
+    """Indexes all Thing subclasses of the cargo and api models by their @type IRI"""
+    index: dict[str, type] = {}
+    for module in (cargo, api):
+        for class_ in vars(module).values():
+            if (
+                isinstance(class_, type)
+                and issubclass(class_, Thing)
+                and class_.__module__ == module.__name__
+                # abstract parent class, never instantiated on its own
+                and class_ is not LogisticsObject
+            ):
+                type_field = class_.__fields__.get("type")
+                if type_field is not None and isinstance(type_field.default, str):
+                    index[type_field.default] = class_
+    return index
+
+
+type_class_index: dict[str, type] = _build_type_class_index()
+type_class_mapping: dict[str, str] = {
+    iri: class_.__name__ for iri, class_ in type_class_index.items()
 }
+REVISION_IRI: str = "https://onerecord.iata.org/LogisticsObject#revision"
+
 data_type_iri_mapping: dict = {
     str: "http://www.w3.org/2001/XMLSchema#string",
     bool: "http://www.w3.org/2001/XMLSchema#boolean",
@@ -71,82 +63,754 @@ data_type_iri_mapping: dict = {
 }
 
 
+@functools.lru_cache(maxsize=None)
+def _resolve_class(types: tuple) -> Optional[type]:
+    """
+    Returns the model class for the given @type IRIs.
+    If several IRIs are known, the most specific class wins,
+    e.g. PieceDg for ["https://onerecord.iata.org/Piece", "https://onerecord.iata.org/PieceDg"].
+    """
+    classes: list[type] = [type_class_index[t] for t in types if t in type_class_index]
+    for class_ in classes:
+        if all(issubclass(class_, other) for other in classes):
+            return class_
+    return classes[0] if classes else None
+
+
+def get_class_by_type(types: Union[str, list[str], tuple]) -> Optional[type]:
+    """Returns the model class for a @type value (IRI or list of IRIs)"""
+    if isinstance(types, str):
+        types = (types,)
+    return _resolve_class(tuple(types))
+
+
+# shared instances of IRIs, bounded so that unique IRIs cannot grow it forever
+IRI_TABLE_MAX_SIZE: int = 65536
+_iri_table: dict[str, str] = {iri: iri for iri in type_class_index}
+
+
+def intern_iri(iri: str) -> str:
+    """
+    Returns a shared instance of the given IRI, so that the many models
+    referencing the same @type or IRI value do not keep their own copies
+    """
+    shared_iri = _iri_table.get(iri)
+    if shared_iri is None:
+        if len(_iri_table) >= IRI_TABLE_MAX_SIZE:
+            return iri
+        shared_iri = _iri_table.setdefault(iri, iri)
+    return shared_iri
+
+
+def _intern_iris(value: Any) -> None:
+    """
+    Replaces the @type entries and IRI values of a decoded JSON-LD dict
+    or list in place by shared instances. @id values are mostly unique
+    and therefore kept.
+    """
+    if isinstance(value, dict):
+        items: Iterable = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return
+    for key, v in items:
+        if isinstance(v, str):
+            if key != "@id" and v.startswith(("https://", "http://")):
+                value[key] = intern_iri(v)
+        elif isinstance(v, (dict, list)):
+            _intern_iris(v)
+
+
 def dict_to_thing(
     thing_dict: Any,
 ) -> Optional[Thing]:
     if type(thing_dict) in data_type_iri_mapping:
         return thing_dict
+    if "@context" in thing_dict:
+        thing_dict = expand_json_ld(thing_dict)
     if "@type" in thing_dict:
-        input_thing_type: Optional[str] = next(
-            (t for t in type_class_mapping if t in thing_dict["@type"]),
-            None,
-        )
-        if input_thing_type:
+        _intern_iris(thing_dict)
+        class_ = get_class_by_type(thing_dict["@type"])
+        if class_:
             if type(thing_dict["@type"]) is str:
                 thing_dict["@type"] = [thing_dict["@type"]]
-            module = importlib.import_module("onerecord.models.cargo")
-            class_ = getattr(module, type_class_mapping[input_thing_type])
-            return class_(**thing_dict)
+            return class_(**_resolve_nested_types(class_, thing_dict))
     return None
 
 
+@functools.lru_cache(maxsize=None)
+def _get_thing_fields(class_: type[Thing]) -> tuple:
+    """
+    Returns (alias, name, type, is_list) of all fields of a model class
+    that hold nested Things, computed once per class
+    """
+    return tuple(
+        (field.alias, name, field.type_, field.shape != SHAPE_SINGLETON)
+        for name, field in class_.__fields__.items()
+        if isinstance(field.type_, type) and issubclass(field.type_, Thing)
+    )
+
+
+def _resolve_nested_types(class_: type[Thing], thing_dict: dict) -> dict:
+    """
+    Returns the dict with all nested Things whose @type names a subclass
+    of the declared field type replaced by instances of that subclass,
+    so that pydantic does not validate them against the declared base class
+    """
+    resolved_dict: Optional[dict] = None
+    for alias, name, type_, is_list in _get_thing_fields(class_):
+        key = alias if alias in thing_dict else name
+        value = thing_dict.get(key)
+        if value is None:
+            continue
+        if is_list and isinstance(value, list):
+            resolved_value: Any = [_resolve_nested_type(type_, v) for v in value]
+            changed = any(r is not v for r, v in zip(resolved_value, value))
+        else:
+            resolved_value = _resolve_nested_type(type_, value)
+            changed = resolved_value is not value
+        if changed:
+            if resolved_dict is None:
+                resolved_dict = dict(thing_dict)
+            resolved_dict[key] = resolved_value
+    return thing_dict if resolved_dict is None else resolved_dict
+
+
+def _resolve_nested_type(type_: type[Thing], value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    if "@type" in value:
+        class_ = get_class_by_type(value["@type"])
+        if class_ is not None and class_ is not type_ and issubclass(class_, type_):
+            try:
+                return class_(**_resolve_nested_types(class_, value))
+            except ValidationError as e:
+                # a reference like {"@id", "@type"} or a summary of the object
+                # lacks required fields and is left to the declared class,
+                # invalid values are errors
+                if not value.keys() <= {"@id", "@type"} and any(
+                    error["type"] != "value_error.missing" for error in e.errors()
+                ):
+                    raise
+                logger.debug(
+                    f"{value.get('@id')} is a reference to a {class_.__name__}"
+                )
+    return _resolve_nested_types(type_, value)
+
+
+def _get_value_converter(type_: Any) -> Optional[Callable[[Any], Any]]:
+    """Returns the conversion of decoded JSON values to the field type, if any"""
+    if isinstance(type_, type):
+        if issubclass(type_, Thing):
+            return lambda v: construct_thing(type_, v) if isinstance(v, dict) else v
+        if issubclass(type_, enum.Enum):
+            return lambda v: v if isinstance(v, enum.Enum) else type_(v)
+        if type_ is datetime.datetime:
+            return (
+                lambda v: parse_datetime(v) if isinstance(v, (str, int, float)) else v
+            )
+        if type_ is datetime.timedelta:
+            return (
+                lambda v: parse_duration(v) if isinstance(v, (str, int, float)) else v
+            )
+    return None
+
+
+_IMMUTABLE_DEFAULT_TYPES: tuple = (type(None), str, int, float, bool, enum.Enum)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_construct_plan(class_: type[Thing]) -> tuple[dict, dict, tuple]:
+    """
+    Returns the fields of a model class by alias and by name as
+    (name, is_list, converter, is_alias), the immutable defaults and the
+    fields with other defaults, computed once per class
+    """
+    keys: dict[str, tuple] = {}
+    defaults: dict[str, Any] = {}
+    other_defaults: list[tuple[str, ModelField]] = []
+    for name, field in class_.__fields__.items():
+        is_list: bool = field.shape != SHAPE_SINGLETON
+        converter = _get_value_converter(field.type_)
+        keys.setdefault(name, (name, is_list, converter, False))
+        keys[field.alias] = (name, is_list, converter, True)
+        if not field.required:
+            if isinstance(field.default, _IMMUTABLE_DEFAULT_TYPES) and (
+                field.default_factory is None
+            ):
+                defaults[name] = field.default
+            else:
+                other_defaults.append((name, field))
+    return keys, defaults, tuple(other_defaults)
+
+
+def construct_thing(class_: type[ThingT], thing_dict: dict) -> ThingT:
+    """
+    Builds a Thing of the given class and its nested Things from a dict
+    without pydantic validation. Only use it for trusted input, e.g. from
+    a ONE Record server that already validated the data.
+    A more specific subclass named in @type is used if there is one.
+    """
+    if "@type" in thing_dict:
+        type_class = get_class_by_type(thing_dict["@type"])
+        if type_class is not None and issubclass(type_class, class_):
+            class_ = type_class
+    keys, defaults, other_defaults = _get_construct_plan(class_)
+    values: dict = {}
+    for key, value in thing_dict.items():
+        entry = keys.get(key)
+        if entry is None:
+            continue
+        name, is_list, converter, is_alias = entry
+        if not is_alias and name in values:
+            # the alias takes precedence over the field name
+            continue
+        if value is None:
+            values[name] = None
+            continue
+        if is_list and not isinstance(value, list):
+            value = [value]
+        if is_list:
+            value = TrackedList(value if converter is None else map(converter, value))
+        elif converter is not None:
+            value = converter(value)
+        values[name] = value
+    # the same as BaseModel.construct, without walking all fields again
+    thing = class_.__new__(class_)
+    fields_values: dict = dict(defaults)
+    for name, field in other_defaults:
+        if name not in values:
+            fields_values[name] = field.get_default()
+    fields_values.update(values)
+    object.__setattr__(thing, "__dict__", fields_values)
+    object.__setattr__(thing, "__fields_set__", set(values))
+    thing._init_private_attributes()
+    return thing
+
+
+def validate_thing(thing: Thing) -> Thing:
+    """
+    Validates a Thing, e.g. one built without validation by construct_thing,
+    and returns a validated copy. Raises a pydantic ValidationError if invalid.
+    """
+    thing_dict: dict = thing.dict(exclude_none=True, by_alias=True)
+    _normalize_types(thing_dict)
+    # nested subclasses, e.g. a PieceDg in Piece#containedPieces, are kept
+    validated_thing = type(thing)(**_resolve_nested_types(type(thing), thing_dict))
+    if isinstance(thing, LogisticsObject):
+        validated_thing._revision = thing._revision
+    return validated_thing
+
+
+class LazyThing:
+    """
+    Read-only proxy of a Thing that keeps the decoded JSON-LD dict and
+    validates a field only when it is read for the first time. Nested
+    Things are returned as LazyThing as well, so that only the parts of
+    an object that are actually accessed are materialized.
+    Use to_thing() to get the fully validated model.
+    """
+
+    __slots__ = ("_class", "_raw", "_values", "_revision")
+
+    def __init__(self, class_: type[Thing], thing_dict: dict):
+        if "@type" in thing_dict:
+            type_class = get_class_by_type(thing_dict["@type"])
+            if type_class is not None and issubclass(type_class, class_):
+                class_ = type_class
+        self._class: type[Thing] = class_
+        self._raw: dict = thing_dict
+        self._values: dict = {}
+        self._revision: Optional[int] = thing_dict.get(REVISION_IRI)
+
+    @property
+    def model_class(self) -> type[Thing]:
+        return self._class
+
+    @property
+    def raw(self) -> dict:
+        return self._raw
+
+    def __getattr__(self, name: str) -> Any:
+        # private attributes are never fields, e.g. while copying or unpickling
+        if name.startswith("_"):
+            raise AttributeError(name)
+        field: Optional[ModelField] = self._class.__fields__.get(name)
+        if field is None:
+            raise AttributeError(
+                f"'{self._class.__name__}' object has no attribute '{name}'"
+            )
+        if name not in self._values:
+            if field.alias in self._raw:
+                value = self._materialize(field, self._raw[field.alias])
+            elif name in self._raw:
+                value = self._materialize(field, self._raw[name])
+            else:
+                value = field.get_default()
+            self._values[name] = value
+        return self._values[name]
+
+    def _materialize(self, field: ModelField, value: Any) -> Any:
+        if value is None:
+            return None
+        if isinstance(field.type_, type) and issubclass(field.type_, Thing):
+            if field.shape != SHAPE_SINGLETON:
+                values = value if isinstance(value, list) else [value]
+                if all(isinstance(v, dict) for v in values):
+                    return [LazyThing(field.type_, v) for v in values]
+            elif isinstance(value, dict):
+                return LazyThing(field.type_, value)
+        validated_value, errors = field.validate(
+            value, {}, loc=field.alias, cls=self._class
+        )
+        if errors:
+            raise ValidationError([errors], self._class)
+        return validated_value
+
+    def to_thing(self) -> Thing:
+        """Validates the whole object and returns it as model instance"""
+        thing = self._class(**_resolve_nested_types(self._class, self._raw))
+        if isinstance(thing, LogisticsObject):
+            thing._revision = self._revision
+        return thing
+
+    def __repr__(self) -> str:
+        return f"Lazy{self._class.__name__}(id={self._raw.get('@id')!r})"
+
+
 def dict_to_logistics_object(
     logistics_object_dict: dict,
+    validate: bool = True,
 ) -> Optional[LogisticsObject]:
+    if "@context" in logistics_object_dict:
+        logistics_object_dict = expand_json_ld(logistics_object_dict)
     if "@type" in logistics_object_dict:
-        logistics_object_type: Optional[str] = next(
-            (t for t in type_class_mapping if t in logistics_object_dict["@type"]),
-            None,
-        )
-        if logistics_object_type:
-            module = importlib.import_module("onerecord.models.cargo")
-            class_ = getattr(module, type_class_mapping[logistics_object_type])
-            return class_(**logistics_object_dict)
+        class_ = get_class_by_type(logistics_object_dict["@type"])
+        if class_:
+            _intern_iris(logistics_object_dict)
+            if validate:
+                logistics_object = class_(
+                    **_resolve_nested_types(class_, logistics_object_dict)
+                )
+            else:
+                logistics_object = construct_thing(class_, logistics_object_dict)
+            if (
+                isinstance(logistics_object, LogisticsObject)
+                and REVISION_IRI in logistics_object_dict
+            ):
+                logistics_object._revision = logistics_object_dict[REVISION_IRI]
+            return logistics_object
     return None
 
 
 def json_to_logistics_object(
-    logistics_object_json: str,
+    logistics_object_json: codec.JSONInput,
+    validate: bool = True,
 ) -> Optional[LogisticsObject]:
-    """Parses the given dict to a LogisticObject"""
-    logistics_object_dict: dict = json.loads(logistics_object_json)
+    """
+    Parses the given dict to a LogisticObject.
+    With validate=False pydantic validation is skipped for trusted input.
+    """
+    logistics_object_dict: dict = codec.loads(logistics_object_json)
     if logistics_object_dict:
-        return dict_to_logistics_object(logistics_object_dict=logistics_object_dict)
+        return dict_to_logistics_object(
+            logistics_object_dict=logistics_object_dict, validate=validate
+        )
     return None
 
 
 def json_to_logistics_objects(
-    logistics_objects_json: str,
+    logistics_objects_json: codec.JSONInput,
+    validate: bool = True,
+    max_workers: Optional[int] = None,
 ) -> list[LogisticsObject]:
-    """Parses the given JSON to a list of LogisticObject"""
-    logistic_objects: list[LogisticsObject] = []
-    logistics_objects_list: list = json.loads(logistics_objects_json)
-    if len(logistics_objects_list) > 0:
-        for logistics_object_dict in logistics_objects_list:
-            logistic_object = dict_to_logistics_object(
-                logistics_object_dict=logistics_object_dict
+    """
+    Parses the given JSON to a list of LogisticObject.
+    With validate=False pydantic validation is skipped for trusted input.
+    With max_workers the objects are built in a process pool,
+    see iter_logistics_object_chunks_parallel.
+    """
+    if max_workers is not None:
+        return [
+            logistics_object
+            for chunk in iter_logistics_object_chunks_parallel(
+                logistics_objects_json, validate=validate, max_workers=max_workers
             )
-            if logistic_object:
-                logistic_objects.append(logistic_object)
+            for logistics_object in chunk
+        ]
+    logistics_objects_list: list = codec.loads(logistics_objects_json)
+    return _dicts_to_logistics_objects(logistics_objects_list, validate=validate)
+
 
+def _dicts_to_logistics_objects(
+    logistics_object_dicts: list, validate: bool = True
+) -> list[LogisticsObject]:
+    logistic_objects: list[LogisticsObject] = []
+    for logistics_object_dict in logistics_object_dicts:
+        logistic_object = dict_to_logistics_object(
+            logistics_object_dict=logistics_object_dict, validate=validate
+        )
+        if logistic_object:
+            logistic_objects.append(logistic_object)
     return logistic_objects
 
 
-def json_to_events(events_json: str) -> list[Event]:
-    """Parses the given JSON to a list of Event"""
+def iter_logistics_object_chunks_parallel(
+    logistics_objects_json: codec.JSONInput,
+    validate: bool = True,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 1000,
+    ordered: bool = True,
+    executor: Optional[Executor] = None,
+) -> Iterator[list[LogisticsObject]]:
+    """
+    Decodes the given JSON array and builds its LogisticsObject in chunks
+    of chunk_size objects in a process pool with max_workers processes
+    (default: number of CPUs). Yields the chunks in order, or as soon as
+    they are finished with ordered=False. An existing executor can be
+    passed to reuse its worker processes.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    logistics_objects_list: list = codec.loads(logistics_objects_json)
+    chunks: list[list] = [
+        logistics_objects_list[i : i + chunk_size]
+        for i in range(0, len(logistics_objects_list), chunk_size)
+    ]
+    if not chunks:
+        return
+    own_executor: Optional[Executor] = None
+    if executor is None:
+        executor = own_executor = ProcessPoolExecutor(
+            max_workers=min(max_workers or os.cpu_count() or 1, len(chunks))
+        )
+    try:
+        futures: list[Future] = [
+            executor.submit(_dicts_to_logistics_objects, chunk, validate)
+            for chunk in chunks
+        ]
+        for future in futures if ordered else as_completed(futures):
+            yield future.result()
+    finally:
+        if own_executor is not None:
+            own_executor.shutdown(cancel_futures=True)
+
+
+def dict_to_lazy_logistics_object(
+    logistics_object_dict: dict,
+) -> Optional[LazyThing]:
+    if "@context" in logistics_object_dict:
+        logistics_object_dict = expand_json_ld(logistics_object_dict)
+    if "@type" in logistics_object_dict:
+        class_ = get_class_by_type(logistics_object_dict["@type"])
+        if class_:
+            _intern_iris(logistics_object_dict)
+            return LazyThing(class_, logistics_object_dict)
+    return None
+
+
+def json_to_lazy_logistics_objects(
+    logistics_objects_json: codec.JSONInput,
+) -> list[LazyThing]:
+    """
+    Parses the given JSON to a list of LazyThing proxies of LogisticObject,
+    fields are only validated when they are read
+    """
+    lazy_logistics_objects: list[LazyThing] = []
+    for logistics_object_dict in codec.loads(logistics_objects_json):
+        lazy_logistics_object = dict_to_lazy_logistics_object(logistics_object_dict)
+        if lazy_logistics_object:
+            lazy_logistics_objects.append(lazy_logistics_object)
+    return lazy_logistics_objects
+
+
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def iter_json_array(chunks: Iterable[codec.JSONInput]) -> Iterator[Any]:
+    """
+    Incrementally parses a JSON array from chunks of UTF-8 bytes or text
+    and yields its elements one by one. Only the element that is currently
+    parsed is kept in memory, not the whole document.
+    """
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunk_iterator = iter(chunks)
+    # parsed up to pos, the consumed prefix is only dropped when joining
+    buffer: str = ""
+    pos: int = 0
+    # chunks read but not joined yet, so that a large element is joined
+    # only a few times instead of once per chunk
+    pending: list[str] = []
+    pending_size: int = 0
+    exhausted: bool = False
+    in_array: bool = False
+
+    def read() -> bool:
+        nonlocal pending_size, exhausted
+        for chunk in chunk_iterator:
+            if not isinstance(chunk, str):
+                chunk = utf8_decoder.decode(chunk)
+            if chunk:
+                pending.append(chunk)
+                pending_size += len(chunk)
+                return True
+        pending.append(utf8_decoder.decode(b"", final=True))
+        exhausted = True
+        return False
+
+    def join() -> None:
+        nonlocal buffer, pos, pending_size
+        if pending:
+            buffer = buffer[pos:] + "".join(pending)
+            pos = 0
+            pending.clear()
+            pending_size = 0
+
+    expect_separator: bool = False
+
+    while True:
+        pos = _JSON_WHITESPACE.match(buffer, pos).end()  # type: ignore[union-attr]
+        if pos == len(buffer):
+            if pending:
+                join()
+                continue
+            if exhausted:
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            read()
+            continue
+
+        if not in_array:
+            if buffer[pos] != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, pos)
+            pos += 1
+            in_array = True
+            continue
+        if buffer[pos] == "]":
+            return
+        if expect_separator:
+            if buffer[pos] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            expect_separator = False
+            continue
+
+        # join and retry only after the data doubled to keep large elements linear
+        min_size = 0
+        while True:
+            if len(buffer) - pos + pending_size >= min_size or exhausted:
+                join()
+                try:
+                    element, end = decoder.raw_decode(buffer, pos)
+                    # a number might continue in the next chunk
+                    if end < len(buffer) or exhausted:
+                        break
+                except json.JSONDecodeError:
+                    if exhausted:
+                        raise
+                min_size = 2 * (len(buffer) - pos)
+            read()
+        pos = end
+        expect_separator = True
+        yield element
+
+
+def iter_json_to_logistics_objects(
+    logistics_objects_json: Iterable[codec.JSONInput],
+    validate: bool = True,
+) -> Iterator[LogisticsObject]:
+    """
+    Parses the given chunks of a JSON array incrementally
+    and yields one LogisticsObject at a time
+    """
+    for logistics_object_dict in iter_json_array(logistics_objects_json):
+        logistics_object = dict_to_logistics_object(
+            logistics_object_dict=logistics_object_dict, validate=validate
+        )
+        if logistics_object:
+            yield logistics_object
+
+
+def json_to_events(events_json: codec.JSONInput, validate: bool = True) -> list[Event]:
+    """
+    Parses the given JSON to a list of Event.
+    With validate=False pydantic validation is skipped for trusted input.
+    """
     events: list[Event] = []
-    events_list: list = json.loads(events_json)
+    events_list: list = codec.loads(events_json)
     if len(events_list) > 0:
         for event_dict in events_list:
-            event: Event = Event(**event_dict)
+            if "@context" in event_dict:
+                event_dict = expand_json_ld(event_dict)
+            _intern_iris(event_dict)
+            event: Event = (
+                Event(**_resolve_nested_types(Event, event_dict))
+                if validate
+                else construct_thing(Event, event_dict)
+            )
             if event:
                 events.append(event)
     return events
 
 
+# @context of compact JSON-LD, ONE Record IRIs become relative to @vocab
+ONE_RECORD_VOCAB: str = "https://onerecord.iata.org/"
+ONE_RECORD_CONTEXT: dict = {"@vocab": ONE_RECORD_VOCAB}
+
+
+def compact_iri(iri: str) -> str:
+    """Returns the IRI relative to ONE_RECORD_VOCAB, e.g. Piece#grossWeight"""
+    if iri.startswith(ONE_RECORD_VOCAB):
+        return iri[len(ONE_RECORD_VOCAB) :]
+    return iri
+
+
+def _get_value_encoder(
+    class_: type[Thing], type_: Any, compact: bool
+) -> Optional[Callable]:
+    if isinstance(type_, type):
+        if issubclass(type_, Thing):
+            if compact:
+                return functools.partial(_thing_to_json_dict, compact=True)
+            return _thing_to_json_dict
+        if issubclass(type_, enum.Enum):
+            return operator.attrgetter("value")
+        for base in type_.__mro__[:-1]:
+            if base in class_.__config__.json_encoders:
+                return class_.__config__.json_encoders[base]
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_serializer_plan(class_: type[Thing], compact: bool = False) -> tuple:
+    """
+    Returns (name, key, is_list, type, encoder) of all fields of a model
+    class, computed once per class. encoder converts values of the field
+    type to JSON compatible values, e.g. nested Things, enums and datetimes.
+    With compact, keys and @type values are relative to ONE_RECORD_VOCAB.
+    """
+    return tuple(
+        (
+            name,
+            compact_iri(field.alias) if compact else field.alias,
+            field.shape != SHAPE_SINGLETON,
+            field.type_ if isinstance(field.type_, type) else object,
+            compact_iri
+            if compact and field.alias == "@type"
+            else _get_value_encoder(class_, field.type_, compact),
+        )
+        for name, field in class_.__fields__.items()
+    )
+
+
+def _thing_to_json_dict(thing: Thing, compact: bool = False) -> dict:
+    """Same as thing.dict(exclude_none=True, by_alias=True) with encoded values"""
+    json_dict: dict = {}
+    values: dict = thing.__dict__
+    for name, key, is_list, type_, encoder in _get_serializer_plan(
+        type(thing), compact
+    ):
+        value = values.get(name)
+        if value is None:
+            continue
+        if encoder is not None:
+            if is_list and isinstance(value, list):
+                value = [encoder(v) if isinstance(v, type_) else v for v in value]
+            elif isinstance(value, type_):
+                value = encoder(value)
+        json_dict[key] = value
+    return json_dict
+
+
+def thing_to_json(thing: Thing, compact: bool = False) -> bytes:
+    """
+    Serializes the given Thing to JSON-LD bytes, omitting None values.
+    Uses a serializer plan per model class instead of thing.json().
+    With compact, compact JSON-LD with ONE_RECORD_CONTEXT as @context
+    and short keys is written, see expand_json_ld for the reverse.
+    """
+    json_dict: dict = _thing_to_json_dict(thing, compact=compact)
+    if compact:
+        json_dict = {"@context": ONE_RECORD_CONTEXT, **json_dict}
+    return codec.dumps(json_dict, default=thing.__json_encoder__)
+
+
+def _expand_iri(term: str, context: dict) -> str:
+    if term in context and isinstance(context[term], str):
+        return context[term]
+    if ":" in term:
+        prefix, suffix = term.split(":", 1)
+        if prefix in context and not suffix.startswith("//"):
+            return context[prefix] + suffix
+        return term
+    if "@vocab" in context:
+        return context["@vocab"] + term
+    return term
+
+
+def _merge_context(context: dict, local_context: Any) -> dict:
+    merged_context: dict = dict(context)
+    for c in local_context if isinstance(local_context, list) else [local_context]:
+        if c is None:
+            merged_context = {}
+        elif isinstance(c, dict):
+            merged_context.update(c)
+        else:
+            # remote contexts are not fetched, documents using them are
+            # expected to use full IRIs like the ONE Record servers do
+            logger.debug(f"Skipping remote JSON-LD @context {c}")
+    # term definitions may use prefixes or be relative to @vocab as well
+    for term, iri in merged_context.items():
+        if not term.startswith("@") and isinstance(iri, str):
+            merged_context[term] = _expand_iri(iri, merged_context)
+    return merged_context
+
+
+def expand_json_ld(value: Any, context: Optional[dict] = None) -> Any:
+    """
+    Expands keys and @type values of a compact JSON-LD document to full IRIs
+    as used by the models, @type values always become lists. Supports
+    embedded contexts with @vocab, prefixes and simple term definitions,
+    e.g. documents written by thing_to_json(thing, compact=True). Remote
+    contexts are skipped, only the embedded parts of a context are applied.
+    """
+    if isinstance(value, list):
+        return [expand_json_ld(v, context) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if context is None:
+        context = {}
+    if "@context" in value:
+        context = _merge_context(context, value["@context"])
+    expanded_dict: dict = {}
+    for key, v in value.items():
+        if key == "@context":
+            continue
+        if key == "@type":
+            if isinstance(v, list):
+                v = [_expand_iri(t, context) for t in v]
+            elif isinstance(v, str):
+                v = [_expand_iri(v, context)]
+        elif not key.startswith("@"):
+            key = _expand_iri(key, context)
+            v = expand_json_ld(v, context)
+        expanded_dict[key] = v
+    return expanded_dict
+
+
 def _generate_operation_object_from_patch(patch: dict) -> Optional[OperationObject]:
     if "value" in patch:
-        value = str(patch["value"])
+        if isinstance(patch["value"], enum.Enum):
+            return OperationObject(
+                datatype=data_type_iri_mapping[str], value=str(patch["value"].value)
+            )
+        # nested Things are sent as JSON-LD, so that they can be applied again
+        value = (
+            thing_to_json(patch["value"]).decode("utf-8")
+            if isinstance(patch["value"], Thing)
+            else str(patch["value"])
+        )
         if type(patch["value"]) in data_type_iri_mapping:
             return OperationObject(
                 datatype=data_type_iri_mapping[type(patch["value"])],
@@ -163,12 +827,12 @@ def _generate_operation_object_from_patch(patch: dict) -> Optional[OperationObje
                 return OperationObject(
                     datatype=getattr(patch["value"], "type"), value=value
                 )
-            elif type(getattr(patch["value"], "type")) is list:
+            elif isinstance(getattr(patch["value"], "type"), list):
                 data_type_iri: Optional[str] = next(
                     (
                         t
-                        for t in type_class_mapping
-                        if t in getattr(patch["value"], "type")
+                        for t in getattr(patch["value"], "type")
+                        if t in type_class_index
                     ),
                     None,
                 )
@@ -177,74 +841,256 @@ def _generate_operation_object_from_patch(patch: dict) -> Optional[OperationObje
     return None
 
 
-def _generate_patches(src: Thing, dst: Thing) -> list[dict]:
-    src_dict: dict = src.dict(exclude_none=True, by_alias=True)
-    dst_dict: dict = dst.dict(exclude_none=True, by_alias=True)
-    patches: list[dict] = []
+def _escape_path_segment(segment: Union[str, int]) -> str:
+    return str(segment).replace("~", "~0").replace("/", "~1")
+
+
+def _is_same_node(src: dict, dst: dict) -> bool:
+    """Two JSON-LD nodes are diffed recursively if they have the same @id"""
+    return src.get("@id") == dst.get("@id")
+
+
+def _append_patches(op: str, path: str, value: Any, patches: list[dict]) -> None:
+    # list properties are sets of values, every value gets its own operation
+    for v in value if isinstance(value, list) else [value]:
+        patches.append(
+            {
+                "op": op,
+                "path": path,
+                "value": dict_to_thing(v) if isinstance(v, dict) else v,
+            }
+        )
+
+
+def _diff_values(
+    src: Any, dst: Any, path: str, patches: list[dict], nested: bool
+) -> None:
+    """
+    Appends del/add patches for the values that differ, with nested the
+    deepest values that differ, otherwise whole list elements and values
+    """
+    if src == dst:
+        return
+    if (
+        nested
+        and isinstance(src, dict)
+        and isinstance(dst, dict)
+        and _is_same_node(src, dst)
+    ):
+        _diff_nodes(src, dst, path, patches, nested)
+    elif isinstance(src, list) and isinstance(dst, list):
+        _diff_lists(src, dst, path, patches, nested)
+    else:
+        _append_patches("del", path, src, patches)
+        _append_patches("add", path, dst, patches)
+
+
+def _get_unique_ids(values: list) -> set:
+    ids: list = [v["@id"] for v in values if isinstance(v, dict) and "@id" in v]
+    return set(ids) if len(ids) == len(set(ids)) else set()
+
+
+def _freeze(value: Any) -> Any:
+    """Returns a hashable representation of a JSON-LD value for sequence diffs"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _diff_lists(
+    src: list, dst: list, path: str, patches: list[dict], nested: bool
+) -> None:
+    """
+    Diffs list properties element by element. Elements with an @id are
+    matched by @id regardless of their position, anonymous elements are
+    matched by a sequence diff. With nested, changed elements of the same
+    @id or position are diffed recursively with the @id or index as path
+    segment, otherwise they are replaced as a whole.
+    Emits nested changes first, then del and add operations.
+    """
+    src_ids: set = _get_unique_ids(src)
+    dst_ids: set = _get_unique_ids(dst)
+    ids: set = src_ids & dst_ids
+    dst_by_id: dict = {
+        v["@id"]: v for v in dst if isinstance(v, dict) and v.get("@id") in ids
+    }
+    nested_patches: list[dict] = []
+    removed: list = []
+    added: list = []
+
+    src_anonymous: list[tuple[int, Any]] = []
+    for index, v in enumerate(src):
+        if isinstance(v, dict) and v.get("@id") in ids:
+            if nested:
+                _diff_values(
+                    v,
+                    dst_by_id[v["@id"]],
+                    f"{path}/{_escape_path_segment(v['@id'])}",
+                    nested_patches,
+                    nested,
+                )
+            elif v != dst_by_id[v["@id"]]:
+                removed.append(v)
+                added.append(dst_by_id[v["@id"]])
+        elif isinstance(v, dict) and v.get("@id") in src_ids:
+            removed.append(v)
+        else:
+            src_anonymous.append((index, v))
+    dst_anonymous: list = []
+    for v in dst:
+        if isinstance(v, dict) and v.get("@id") in dst_ids:
+            if v["@id"] not in ids:
+                added.append(v)
+        else:
+            dst_anonymous.append(v)
+
+    if src_anonymous or dst_anonymous:
+        matcher = difflib.SequenceMatcher(
+            None,
+            [_freeze(v) for _, v in src_anonymous],
+            [_freeze(v) for v in dst_anonymous],
+            autojunk=False,
+        )
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            if tag == "replace" and i2 - i1 == j2 - j1:
+                for (index, src_value), dst_value in zip(
+                    src_anonymous[i1:i2], dst_anonymous[j1:j2]
+                ):
+                    if (
+                        nested
+                        and isinstance(src_value, dict)
+                        and isinstance(dst_value, dict)
+                        and _is_same_node(src_value, dst_value)
+                    ):
+                        _diff_nodes(
+                            src_value,
+                            dst_value,
+                            f"{path}/{index}",
+                            nested_patches,
+                            nested,
+                        )
+                    else:
+                        removed.append(src_value)
+                        added.append(dst_value)
+                continue
+            removed.extend(v for _, v in src_anonymous[i1:i2])
+            added.extend(dst_anonymous[j1:j2])
+
+    patches.extend(nested_patches)
+    _append_patches("del", path, removed, patches)
+    _append_patches("add", path, added, patches)
+
+
+def _diff_nodes(
+    src_dict: dict, dst_dict: dict, path: str, patches: list[dict], nested: bool
+) -> None:
     src_keys = set(src_dict.keys()) - {"id", "@id", "type", "@type"}
     dst_keys = set(dst_dict.keys()) - {"id", "@id", "type", "@type"}
 
-    if src_keys and dst_keys:
-        removed_properties = sorted(src_keys - dst_keys)
-        for removed_property in removed_properties:
-            patches.append(
-                {
-                    "op": "del",
-                    "path": removed_property,
-                    "value": dict_to_thing(src_dict[removed_property]),
-                }
-            )
+    for removed_property in sorted(src_keys - dst_keys):
+        _append_patches(
+            "del",
+            f"{path}/{_escape_path_segment(removed_property)}",
+            src_dict[removed_property],
+            patches,
+        )
 
-        added_properties = sorted(dst_keys - src_keys)
-        for added_property in added_properties:
-            patches.append(
-                {
-                    "op": "add",
-                    "path": added_property,
-                    "value": dict_to_thing(dst_dict[added_property]),
-                }
-            )
+    for added_property in sorted(dst_keys - src_keys):
+        _append_patches(
+            "add",
+            f"{path}/{_escape_path_segment(added_property)}",
+            dst_dict[added_property],
+            patches,
+        )
 
-        replaced_property_candidates = sorted(src_keys & dst_keys)
-        for replaced_property_candidate in replaced_property_candidates:
-            if (
-                src_dict[replaced_property_candidate]
-                != dst_dict[replaced_property_candidate]
-            ):
-                patches.append(
-                    {
-                        "op": "del",
-                        "path": replaced_property_candidate,
-                        "value": dict_to_thing(src_dict[replaced_property_candidate]),
-                    }
-                )
+    for property_candidate in sorted(src_keys & dst_keys):
+        _diff_values(
+            src_dict[property_candidate],
+            dst_dict[property_candidate],
+            f"{path}/{_escape_path_segment(property_candidate)}",
+            patches,
+            nested,
+        )
 
-                patches.append(
-                    {
-                        "op": "add",
-                        "path": replaced_property_candidate,
-                        "value": dict_to_thing(dst_dict[replaced_property_candidate]),
-                    }
-                )
 
+def _generate_patches(src: Thing, dst: Thing, nested: bool = False) -> list[dict]:
+    """
+    Diffs two Things and returns del/add patches of the changed values of
+    their properties, list properties are diffed element by element.
+    With nested, changed nested objects are diffed recursively and the
+    patches have JSON pointer paths to the deepest changed values, e.g.
+    only the Value#value of a changed grossWeight instead of the whole
+    Value. Nested objects and list elements are only diffed if their @id
+    did not change, otherwise they are replaced as a whole.
+    If dst tracks its changes, see Thing.track_changes, only the
+    changed fields are dumped and diffed.
+    """
+    changed_fields: Optional[set[str]] = dst.changed_fields()
+    patches: list[dict] = []
+    if changed_fields is not None:
+        if changed_fields:
+            _diff_nodes(
+                src.dict(include=changed_fields, exclude_none=True, by_alias=True),
+                dst.dict(include=changed_fields, exclude_none=True, by_alias=True),
+                "",
+                patches,
+                nested,
+            )
+        return patches
+    src_dict: dict = src.dict(exclude_none=True, by_alias=True)
+    dst_dict: dict = dst.dict(exclude_none=True, by_alias=True)
+    if src_dict.keys() - {"@id", "@type"} and dst_dict.keys() - {"@id", "@type"}:
+        _diff_nodes(src_dict, dst_dict, "", patches, nested)
     return patches
 
 
+def _path_to_predicate(path: str) -> str:
+    """
+    Returns the property IRI for paths of top-level properties. Paths to
+    nested values, only generated with nested_paths, are kept as JSON
+    pointer, e.g.
+    /https:~1~1onerecord.iata.org~1Piece#grossWeight/https:~1~1onerecord.iata.org~1Value#value
+    """
+    segments: list[str] = path[1:].split("/") if path.startswith("/") else [path]
+    if len(segments) == 1:
+        return segments[0].replace("~1", "/").replace("~0", "~")
+    return path
+
+
+def _get_revision(logistics_object: LogisticsObject) -> int:
+    revision: Optional[int] = getattr(logistics_object, "_revision", None)
+    if revision is not None:
+        return revision
+    return getattr(logistics_object, "revision", 1)
+
+
 def generate_patch_request(
     original_logistics_object: LogisticsObject,
     updated_logistics_object: LogisticsObject,
     requestor_company_identifier: str,
+    nested_paths: bool = False,
 ) -> PatchRequest:
+    """
+    Generates a PatchRequest with the changes from the original to the
+    updated LogisticsObject. The predicate of each Operation is the IRI of
+    a property, changed nested objects replace the old ones as a whole.
+    With nested_paths, changes of nested objects are sent as JSON pointer
+    predicates to the deepest changed values instead, e.g. for peers that
+    apply them with apply_patch_request. They are no IRIs as the ONE Record
+    API requires, so only use them if the receiver supports them.
+    """
     # TODO: must be further optimized and tested more thoroughly
     operations: list[Operation] = []
     patches: list[dict] = _generate_patches(
-        original_logistics_object, updated_logistics_object
+        original_logistics_object, updated_logistics_object, nested=nested_paths
     )
 
     for patch in patches:
-        patch["path"] = patch["path"].replace("~0", "~").replace("~1", "/")
-        if patch["path"].startswith("/"):
-            patch["path"] = patch["path"][1:]
+        patch["path"] = _path_to_predicate(patch["path"])
         o = _generate_operation_object_from_patch(patch)
         if o:
             operations.append(
@@ -260,10 +1106,221 @@ def generate_patch_request(
             logistics_object_id=original_logistics_object.id,
             logistics_object_type=original_logistics_object.type[0],
         ),
-        revision=getattr(original_logistics_object, "revision")
-        if hasattr(original_logistics_object, "revision")
-        else 1,
+        revision=_get_revision(original_logistics_object),
         requestor_company_identifier=requestor_company_identifier,
         operations=operations,
     )
     return patch_request
+
+
+def _operation_key(operation: Operation) -> tuple:
+    return (operation.p, operation.o.datatype, operation.o.value)
+
+
+def merge_patch_requests(patch_requests: list[PatchRequest]) -> PatchRequest:
+    """
+    Merges PatchRequests for the same LogisticsObject into one PatchRequest
+    with the revision of the first one. The operations are kept in order,
+    an add and a later del of the same value (or a del and a later add)
+    cancel each other out. Raises a ValueError if different values are added
+    to a property that only has one value.
+    """
+    if not patch_requests:
+        raise ValueError("No PatchRequests to merge")
+    first: PatchRequest = patch_requests[0]
+    logistics_object_id: str = first.logistics_object_ref.logistics_object_id
+    operations: list[Operation] = []
+    for patch_request in patch_requests:
+        if patch_request.logistics_object_ref.logistics_object_id != (
+            logistics_object_id
+        ):
+            raise ValueError(
+                f"PatchRequest for {patch_request.logistics_object_ref.logistics_object_id} "
+                f"cannot be merged with PatchRequest for {logistics_object_id}"
+            )
+        for operation in patch_request.operations:
+            key: tuple = _operation_key(operation)
+            for index in range(len(operations) - 1, -1, -1):
+                if _operation_key(operations[index]) == key:
+                    if operations[index].op != operation.op:
+                        del operations[index]
+                        break
+                    # the same operation twice, e.g. from overlapping diffs
+                    break
+            else:
+                operations.append(operation)
+    logistics_object_type: Any = first.logistics_object_ref.logistics_object_type
+    class_: Optional[type] = get_class_by_type(
+        getattr(logistics_object_type, "value", logistics_object_type)
+    )
+    added_predicates: set[str] = set()
+    for operation in operations:
+        if operation.op != "add" or _is_list_predicate(class_, operation.p):
+            continue
+        if operation.p in added_predicates:
+            # e.g. two updates of the same revision that set different values
+            raise ValueError(
+                f"PatchRequests with different values for {operation.p} "
+                f"of {logistics_object_id} cannot be merged"
+            )
+        added_predicates.add(operation.p)
+    return first.copy(update={"operations": operations})
+
+
+def _is_list_predicate(class_: Optional[type], predicate: str) -> bool:
+    """
+    Returns True if the predicate, an IRI or a JSON pointer of nested_paths,
+    is a list property of the class or of its nested classes
+    """
+    is_list: bool = False
+    for segment in _predicate_to_path_segments(predicate):
+        if class_ is None or not issubclass(class_, Thing):
+            return True
+        field = next(
+            (f for f in class_.__fields__.values() if f.alias == segment), None
+        )
+        if field is None:
+            # an element of the list property before, by @id or index
+            continue
+        is_list = field.shape != SHAPE_SINGLETON
+        class_ = field.type_
+    return is_list
+
+
+def _predicate_to_path_segments(predicate: str) -> list[str]:
+    """Reverse of _path_to_predicate, returns the unescaped path segments"""
+    if not predicate.startswith("/"):
+        return [predicate]
+    return [
+        segment.replace("~1", "/").replace("~0", "~")
+        for segment in predicate[1:].split("/")
+    ]
+
+
+def _get_path_child(container: Any, segment: str) -> Any:
+    if isinstance(container, dict) and segment in container:
+        return container[segment]
+    if isinstance(container, list):
+        for element in container:
+            if isinstance(element, dict) and element.get("@id") == segment:
+                return element
+        if segment.isdigit() and int(segment) < len(container):
+            return container[int(segment)]
+    raise ValueError(f"Path segment {segment} not found")
+
+
+def _is_list_property(node: dict, key: str) -> bool:
+    if isinstance(node.get(key), list):
+        return True
+    class_ = get_class_by_type(node["@type"]) if "@type" in node else None
+    if class_ is not None and issubclass(class_, Thing):
+        for field in class_.__fields__.values():
+            if field.alias == key:
+                return field.shape != SHAPE_SINGLETON
+    return False
+
+
+def _operation_value(operation_object: OperationObject) -> Any:
+    if operation_object.datatype in data_type_iri_mapping.values():
+        # converted to the field type when the object is validated
+        return operation_object.value
+    try:
+        value = codec.loads(operation_object.value)
+    except ValueError:
+        value = None
+    if isinstance(value, dict):
+        return value
+    # anything else is a reference to another object
+    return {"@id": operation_object.value, "@type": [operation_object.datatype]}
+
+
+def _matches_value(element: Any, value: Any) -> bool:
+    if isinstance(value, dict):
+        if isinstance(element, dict) and "@id" in value:
+            return element.get("@id") == value["@id"]
+        return element == value
+    if isinstance(element, enum.Enum):
+        element = element.value
+    return element == value or str(element) == value
+
+
+def _normalize_types(value: Any) -> None:
+    """Turns single @type IRIs of nested nodes into lists in place"""
+    if isinstance(value, dict):
+        if isinstance(value.get("@type"), str):
+            value["@type"] = [value["@type"]]
+        for v in value.values():
+            _normalize_types(v)
+    elif isinstance(value, list):
+        for v in value:
+            _normalize_types(v)
+
+
+def _apply_operation(logistics_object_dict: dict, operation: Operation) -> None:
+    segments: list[str] = _predicate_to_path_segments(operation.p)
+    node: Any = logistics_object_dict
+    for segment in segments[:-1]:
+        node = _get_path_child(node, segment)
+    if not isinstance(node, dict):
+        raise ValueError(f"{operation.p} does not address a property")
+    key: str = segments[-1]
+    value: Any = _operation_value(operation.o)
+    if operation.op == "add":
+        if _is_list_property(node, key):
+            node.setdefault(key, []).append(value)
+        else:
+            node[key] = value
+    elif operation.op == "del":
+        if isinstance(node.get(key), list):
+            for index, element in enumerate(node[key]):
+                if _matches_value(element, value):
+                    del node[key][index]
+                    break
+            if not node[key]:
+                del node[key]
+        else:
+            node.pop(key, None)
+    else:
+        raise ValueError(f"Unknown operation {operation.op}")
+
+
+def apply_patch_request(
+    logistics_object: LogisticsObject, patch_request: PatchRequest
+) -> LogisticsObject:
+    """
+    Applies the operations of a PatchRequest, e.g. generated by
+    generate_patch_request, to a LogisticsObject and returns the updated
+    object with the next revision. The given object is not modified.
+    Raises a ValueError if the PatchRequest is meant for another object
+    or revision, or an operation cannot be applied, and a pydantic
+    ValidationError if the result is no valid LogisticsObject.
+    """
+    if (
+        logistics_object.id is not None
+        and patch_request.logistics_object_ref.logistics_object_id
+        != logistics_object.id
+    ):
+        raise ValueError(
+            f"PatchRequest for {patch_request.logistics_object_ref.logistics_object_id} "
+            f"cannot be applied to {logistics_object.id}"
+        )
+    revision: int = int(patch_request.revision)
+    if (
+        logistics_object._revision is not None
+        and logistics_object._revision != revision
+    ):
+        raise ValueError(
+            f"PatchRequest for revision {revision} cannot be applied "
+            f"to revision {logistics_object._revision}"
+        )
+    logistics_object_dict: dict = logistics_object.dict(
+        exclude_none=True, by_alias=True
+    )
+    for operation in patch_request.operations:
+        _apply_operation(logistics_object_dict, operation)
+    _normalize_types(logistics_object_dict)
+    updated_logistics_object = type(logistics_object)(
+        **_resolve_nested_types(type(logistics_object), logistics_object_dict)
+    )
+    updated_logistics_object._revision = revision + 1
+    return updated_logistics_object
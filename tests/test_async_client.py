@@ -0,0 +1,218 @@
+import asyncio
+import unittest
+import unittest.mock
+from datetime import datetime
+
+import pytest
+
+from onerecord.exceptions import ONERecordClientException
+from onerecord.models.api import Notification
+from onerecord.models.cargo import Event, LogisticsObject, Piece
+from onerecord.models.enums import LogisticsObjectType, NotificationEventType
+
+httpx = pytest.importorskip("httpx")
+
+from onerecord.async_client import AsyncONERecordClient  # noqa: E402
+
+piece_json = '{"@id":"http://localhost:8080/companies/test/los/piece-1260233867","@type":["https://onerecord.iata.org/Piece","https://onerecord.iata.org/LogisticsObject"],"https://onerecord.iata.org/Piece#grossWeight":{"@id":"_:1794007512","@type":["https://onerecord.iata.org/Value"],"https://onerecord.iata.org/Value#value":3.922,"https://onerecord.iata.org/Value#unit":"KGM"},"https://onerecord.iata.org/LogisticsObject#revision":0,"https://onerecord.iata.org/LogisticsObject#companyIdentifier":"http://localhost:8080/companies/test","https://onerecord.iata.org/Piece#goodsDescription":"six pack of Koelsch beer"}'
+
+piece_events_json = '[{"@id":"http://localhost:8080/companies/test/los/piece-1260233867/event-1150940089","@type":["https://onerecord.iata.org/Event"],"https://onerecord.iata.org/Event#dateTime":"2022-10-10T19:49:10Z","https://onerecord.iata.org/Event#linkedObject":{"@id":"http://localhost:8080/companies/test/los/piece-1260233867","@type":["https://onerecord.iata.org/Piece","https://onerecord.iata.org/LogisticsObject"],"https://onerecord.iata.org/LogisticsObject#companyIdentifier":"test"},"https://onerecord.iata.org/Event#eventTypeIndicator":"Actual","https://onerecord.iata.org/Event#eventCode":"FOH","https://onerecord.iata.org/Event#eventName":"Freight on Hand"}]'
+
+
+def handler(request):
+    url = str(request.url)
+    if request.method == "POST" and url == "http://localhost:8080/companies/test/los":
+        return httpx.Response(
+            201,
+            headers={
+                "Location": "http://localhost:8080/companies/test/los/piece-1260233867"
+            },
+        )
+    if url.startswith("http://localhost:8080/companies/test/los/piece-asd"):
+        return httpx.Response(404)
+    if url.endswith("/events"):
+        if request.method == "POST":
+            return httpx.Response(201)
+        return httpx.Response(200, text=piece_events_json)
+    if url.endswith("/callback"):
+        return httpx.Response(200)
+    if request.method == "PATCH":
+        return httpx.Response(204)
+    if url.startswith("http://localhost:8080/companies/test/los/"):
+        return httpx.Response(200, text=piece_json)
+    if url.startswith("http://localhost:8080/companies/test/los"):
+        return httpx.Response(200, text=f"[{piece_json}]")
+    return httpx.Response(500)
+
+
+class TestAsyncONERecordClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = AsyncONERecordClient(
+            company_identifier="test",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        super().setUp()
+
+    def tearDown(self) -> None:
+        asyncio.run(self.client.close())
+
+    def test_initiate_client(self):
+        with pytest.raises(ValueError):
+            AsyncONERecordClient()
+        client = AsyncONERecordClient(company_identifier="cgnbeerbrewery")
+        assert client is not None
+        asyncio.run(client.close())
+
+    def test_initiate_client_with_proxies_and_cert(self):
+        transports: list[dict] = []
+        async_http_transport = httpx.AsyncHTTPTransport
+
+        def transport(**kwargs):
+            transports.append(kwargs)
+            return async_http_transport()
+
+        # the certificate files do not exist, only check that they are passed
+        with unittest.mock.patch.object(
+            httpx, "AsyncHTTPTransport", transport
+        ), unittest.mock.patch("ssl.SSLContext.load_cert_chain"):
+            client = AsyncONERecordClient(
+                company_identifier="cgnbeerbrewery",
+                ssl=True,
+                proxies={"https": "http://proxy:3128"},
+                cert=("client.pem", "client.key"),
+            )
+        assert transports[0]["cert"] == ("client.pem", "client.key")
+        assert transports[0]["proxy"] == "http://proxy:3128"
+        asyncio.run(client.close())
+
+    def test_create_logistics_object(self):
+        piece = Piece(
+            **{
+                "company_identifier": "cgnbeerbrewery",
+                "goods_description": "six pack of Koelsch beer",
+                "gross_weight": {"unit": "KGM", "value": 3.922},
+            }
+        )
+        piece_response = asyncio.run(
+            self.client.create_logistics_object(logistics_object=piece)
+        )
+        assert (
+            piece_response.id
+            == "http://localhost:8080/companies/test/los/piece-1260233867"
+        )
+
+    def test_create_logistics_objects(self):
+        pieces = [
+            Piece(
+                **{
+                    "company_identifier": "cgnbeerbrewery",
+                    "goods_description": "six pack of Koelsch beer",
+                    "gross_weight": {"unit": "KGM", "value": 3.922},
+                }
+            )
+            for _ in range(20)
+        ]
+        results = asyncio.run(
+            self.client.create_logistics_objects(
+                logistics_objects=pieces + [None], max_in_flight=4
+            )
+        )
+        assert len(results) == 21
+        assert all(type(result) is Piece for result in results[:20])
+        assert type(results[20]) is ValueError
+
+    def test_client_get_logistics_objects_concurrently(self):
+        async def get_all():
+            return await asyncio.gather(
+                self.client.get_logistics_objects(),
+                self.client.get_logistics_objects(
+                    logistics_object_type=LogisticsObjectType.PIECE
+                ),
+                self.client.get_logistics_object_by_uri(
+                    uri="http://localhost:8080/companies/test/los/piece-1260233867"
+                ),
+            )
+
+        logistics_objects, pieces, piece = asyncio.run(get_all())
+        assert len(logistics_objects) > 0
+        assert isinstance(logistics_objects[0], LogisticsObject)
+        assert type(pieces.pop()) is Piece
+        assert type(piece) is Piece
+
+    def test_client_get_non_existing_logistics_object(self):
+        with pytest.raises(ONERecordClientException):
+            asyncio.run(
+                self.client.get_logistics_object_by_uri(
+                    uri="http://localhost:8080/companies/test/los/piece-asd"
+                )
+            )
+
+    def test_client_events(self):
+        logistics_object_uri: str = (
+            "http://localhost:8080/companies/test/los/piece-1260233867"
+        )
+        event: Event = Event(
+            **{
+                "event_type_indicator": "Actual",
+                "event_code": "FOH",
+                "event_name": "Freight on Hand",
+                "date_time": datetime.utcnow(),
+            }
+        )
+        assert (
+            asyncio.run(
+                self.client.create_event(
+                    logistics_object_uri=logistics_object_uri, event=event
+                )
+            )
+            is True
+        )
+        events = asyncio.run(
+            self.client.get_events_by_logistics_objects_uri(
+                logistics_object_uri=logistics_object_uri
+            )
+        )
+        assert type(events.pop()) is Event
+
+    def test_send_notification(self):
+        notification: Notification = Notification(
+            **{
+                "event_type": NotificationEventType.OBJECT_CREATED.value,
+                "topic": LogisticsObjectType.PIECE.value,
+                "logistics_object": {
+                    "@type": [LogisticsObjectType.PIECE.value],
+                    "@id": "http://localhost:8080/companies/test/los/piece-1260233867",
+                    "company_identifier": "test",
+                },
+            }
+        )
+        assert (
+            asyncio.run(
+                self.client.send_notification(
+                    callback_url="http://localhost:8080/companies/test/callback",
+                    notification=notification,
+                )
+            )
+            is True
+        )
+
+    def test_update_logistics_object(self):
+        updated_piece: Piece = Piece(
+            **{
+                "@id": "http://localhost:8080/companies/test/los/piece-1260233867",
+                "https://onerecord.iata.org/Piece#grossWeight": {
+                    "https://onerecord.iata.org/Value#value": 4.922,
+                    "https://onerecord.iata.org/Value#unit": "KGM",
+                },
+                "https://onerecord.iata.org/LogisticsObject#companyIdentifier": "http://localhost:8080/companies/test",
+                "https://onerecord.iata.org/Piece#goodsDescription": "six pack of Koelsch beer",
+            }
+        )
+        assert (
+            asyncio.run(
+                self.client.update_logistics_object(
+                    updated_logistics_object=updated_piece
+                )
+            )
+            is True
+        )
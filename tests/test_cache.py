@@ -0,0 +1,30 @@
+import pytest
+
+from onerecord.cache import LogisticsObjectCache
+from onerecord.models.cargo import Piece
+
+
+def test_logistics_object_cache():
+    with pytest.raises(ValueError):
+        LogisticsObjectCache(max_size=0)
+    cache = LogisticsObjectCache(max_size=2)
+    piece = Piece(
+        **{
+            "company_identifier": "cgnbeerbrewery",
+            "goods_description": "six pack of Koelsch beer",
+            "gross_weight": {"unit": "KGM", "value": 3.922},
+        }
+    )
+    cache.put("piece-1", piece, etag='"1"')
+    cache.put("piece-2", piece, last_modified="Mon, 17 Oct 2022 10:00:00 GMT")
+    assert cache.get("piece-1").etag == '"1"'
+
+    cache.put("piece-3", piece)
+    assert len(cache) == 2
+    assert "piece-1" in cache
+    assert "piece-2" not in cache
+
+    cache.invalidate("piece-1")
+    assert cache.get("piece-1") is None
+    cache.clear()
+    assert len(cache) == 0
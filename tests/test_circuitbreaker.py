@@ -0,0 +1,53 @@
+import pytest
+
+from onerecord.circuitbreaker import CircuitBreaker, CircuitBreakerState
+from onerecord.exceptions import CircuitBreakerOpenException, ONERecordClientException
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_circuit_breaker():
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold=0)
+    clock = FakeClock()
+    circuit_breaker = CircuitBreaker(
+        failure_threshold=2, recovery_timeout=10, clock=clock
+    )
+    host = "partner-a:8080"
+
+    circuit_breaker.before_request(host)
+    circuit_breaker.record_response(host, 503)
+    circuit_breaker.record_response(host, 200)
+    circuit_breaker.record_response(host, 503)
+    assert circuit_breaker.get_state(host) is CircuitBreakerState.CLOSED
+    circuit_breaker.record_response(host, None)
+    assert circuit_breaker.get_state(host) is CircuitBreakerState.OPEN
+    with pytest.raises(ONERecordClientException):
+        circuit_breaker.before_request(host)
+    circuit_breaker.before_request("partner-b:8080")
+
+    clock.now = 10
+    assert circuit_breaker.get_state(host) is CircuitBreakerState.HALF_OPEN
+    circuit_breaker.before_request(host)
+    with pytest.raises(CircuitBreakerOpenException):
+        circuit_breaker.before_request(host)
+    circuit_breaker.release(host)
+    circuit_breaker.before_request(host)
+    circuit_breaker.record_response(host, 500)
+    assert circuit_breaker.get_state(host) is CircuitBreakerState.OPEN
+
+    clock.now = 20
+    circuit_breaker.before_request(host)
+    circuit_breaker.record_response(host, 404)
+    assert circuit_breaker.get_states() == {
+        host: CircuitBreakerState.CLOSED,
+        "partner-b:8080": CircuitBreakerState.CLOSED,
+    }
+    circuit_breaker.reset()
+    assert circuit_breaker.get_states() == {}
@@ -1,14 +1,22 @@
+import threading
+import time
 import unittest
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
 
 import pytest
+import requests
 import requests_mock
 
+from onerecord.cache import LogisticsObjectCache
+from onerecord.circuitbreaker import CircuitBreaker, CircuitBreakerState
 from onerecord.client import ONERecordClient
-from onerecord.exceptions import ONERecordClientException
+from onerecord.exceptions import CircuitBreakerOpenException, ONERecordClientException
 from onerecord.models.api import Notification
 from onerecord.models.cargo import Event, LogisticsObject, Piece
 from onerecord.models.enums import LogisticsObjectType, NotificationEventType
+from onerecord.ratelimit import RateLimiter
+from onerecord.retry import RetryPolicy
 
 
 def text_create_piece_callback(request, context):
@@ -34,6 +42,21 @@ def text_piece_events_callback(request, context):
     return '[{"@id":"http://localhost:8080/companies/test/los/piece-1260233867/event-1150940089","@type":["https://onerecord.iata.org/Event"],"https://onerecord.iata.org/Event#dateTime":"2022-10-10T19:49:10Z","https://onerecord.iata.org/Event#linkedObject":{"@id":"http://localhost:8080/companies/test/los/piece-1260233867","@type":["https://onerecord.iata.org/Piece","https://onerecord.iata.org/LogisticsObject"],"https://onerecord.iata.org/LogisticsObject#companyIdentifier":"test"},"https://onerecord.iata.org/Event#eventTypeIndicator":"Actual","https://onerecord.iata.org/Event#eventCode":"FOH","https://onerecord.iata.org/Event#eventName":"Freight on Hand"}]'
 
 
+class PieceRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = text_get_piece_callback(None, type("Context", (), {})()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/ld+json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
 class TestONERecordClient(unittest.TestCase):
     def setUp(self) -> None:
         self.client = ONERecordClient(company_identifier="test")
@@ -63,6 +86,53 @@ class TestONERecordClient(unittest.TestCase):
             piece_response.id
             == "http://localhost:8080/companies/test/los/piece-1260233867"
         )
+        assert (
+            "https://onerecord.iata.org/Piece#goodsDescription" in m.last_request.json()
+        )
+
+        client = ONERecordClient(company_identifier="test", compact_json_ld=True)
+        client.create_logistics_object(logistics_object=piece)
+        assert m.last_request.json()["Piece#goodsDescription"] == (
+            "six pack of Koelsch beer"
+        )
+        client.close()
+
+    @requests_mock.mock()
+    def test_create_logistics_objects(self, m):
+        m.post(
+            "http://localhost:8080/companies/test/los",
+            [
+                {"text": text_create_piece_callback},
+                {"status_code": 500},
+                {"text": text_create_piece_callback},
+            ],
+        )
+        pieces = [
+            Piece(
+                **{
+                    "company_identifier": "cgnbeerbrewery",
+                    "goods_description": "six pack of Koelsch beer",
+                    "gross_weight": {"unit": "KGM", "value": 3.922},
+                }
+            )
+            for _ in range(3)
+        ]
+
+        results = self.client.create_logistics_objects(
+            logistics_objects=pieces + [None], max_in_flight=1
+        )
+        assert len(results) == 4
+        assert (
+            results[0].id == "http://localhost:8080/companies/test/los/piece-1260233867"
+        )
+        assert type(results[1]) is ONERecordClientException
+        assert results[1].code == 500
+        assert type(results[2]) is Piece
+        assert type(results[3]) is ValueError
+        with pytest.raises(ValueError):
+            self.client.create_logistics_objects(
+                logistics_objects=pieces, max_in_flight=0
+            )
 
     @requests_mock.mock()
     def test_create_invalid_logistics_object(self, m):
@@ -76,6 +146,38 @@ class TestONERecordClient(unittest.TestCase):
         client = ONERecordClient(company_identifier="cgnbeerbrewery")
         assert client is not None
 
+    def test_connection_pool(self):
+        client = ONERecordClient(
+            company_identifier="test", pool_connections=2, pool_maxsize=20
+        )
+        adapter = client._session.get_adapter("http://localhost:8080")
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 20
+        assert client.pool_stats() == {}
+        client.close()
+
+        server = HTTPServer(("127.0.0.1", 0), PieceRequestHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        uri = f"http://127.0.0.1:{server.server_port}/companies/test/los/piece-1"
+        try:
+            client = ONERecordClient(company_identifier="test")
+            for _ in range(3):
+                assert type(client.get_logistics_object_by_uri(uri=uri)) is Piece
+            stats = client.pool_stats()[f"http://127.0.0.1:{server.server_port}"]
+            assert stats == {"opened": 1, "reused": 2}
+            client.close()
+
+            client = ONERecordClient(company_identifier="test", keep_alive=False)
+            for _ in range(2):
+                client.get_logistics_object_by_uri(uri=uri)
+            stats = client.pool_stats()[f"http://127.0.0.1:{server.server_port}"]
+            assert stats == {"opened": 2, "reused": 0}
+            client.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
     @requests_mock.mock()
     def test_client_get_existing_logistics_object(self, m):
         m.get(
@@ -91,6 +193,35 @@ class TestONERecordClient(unittest.TestCase):
         assert piece.id is not None
         assert type(piece) is Piece
 
+    @requests_mock.mock()
+    def test_client_get_cached_logistics_object(self, m):
+        uri = "http://localhost:8080/companies/test/los/piece-1260233867"
+        m.get(
+            uri,
+            [
+                {
+                    "status_code": 200,
+                    "text": text_get_piece_callback,
+                    "headers": {"ETag": '"rev-0"'},
+                },
+                {"status_code": 304},
+            ],
+        )
+        cache = LogisticsObjectCache()
+        client = ONERecordClient(company_identifier="test", cache=cache)
+
+        piece = client.get_logistics_object_by_uri(uri=uri)
+        assert "If-None-Match" not in m.request_history[0].headers
+        assert uri in cache
+        piece.goods_description = "changed locally"
+
+        cached_piece = client.get_logistics_object_by_uri(uri=uri)
+        assert m.request_history[1].headers["If-None-Match"] == '"rev-0"'
+        assert type(cached_piece) is Piece
+        assert cached_piece.goods_description == "six pack of Koelsch beer"
+        assert cached_piece is not piece
+        client.close()
+
     @requests_mock.mock()
     def test_client_get_non_existing_logistics_object(self, m):
         m.get(
@@ -113,6 +244,67 @@ class TestONERecordClient(unittest.TestCase):
         assert logistics_objects is not None
         assert len(logistics_objects) > 0
 
+    @requests_mock.mock()
+    def test_client_iter_logistics_objects(self, m):
+        m.get(
+            "http://localhost:8080/companies/test/los?type=https://onerecord.iata.org/Piece",
+            status_code=200,
+            text=text_pieces_callback,
+        )
+        logistics_objects = self.client.iter_logistics_objects(
+            logistics_object_type=LogisticsObjectType.PIECE, chunk_size=16
+        )
+        assert not isinstance(logistics_objects, list)
+        pieces = list(logistics_objects)
+        assert len(pieces) == 1
+        assert type(pieces[0]) is Piece
+        assert pieces[0].gross_weight.value == 3.922
+
+        m.get("http://localhost:8080/companies/test/los", status_code=500)
+        with pytest.raises(ONERecordClientException):
+            next(self.client.iter_logistics_objects())
+
+    @requests_mock.mock()
+    def test_client_iter_logistics_object_pages(self, m):
+        pieces_json = text_pieces_callback(None, type("Context", (), {})())
+        m.get(
+            "http://localhost:8080/companies/test/los?limit=1&offset=0",
+            text=text_pieces_callback,
+        )
+        m.get(
+            "http://localhost:8080/companies/test/los?limit=1&offset=1",
+            text=pieces_json.replace("piece-1", "piece-2"),
+            headers={"Link": '</companies/test/los?page=3>; rel="next"'},
+        )
+        m.get(
+            "http://localhost:8080/companies/test/los?page=3",
+            text=pieces_json.replace("piece-1", "piece-3"),
+        )
+        for prefetch in (True, False):
+            pages = self.client.iter_logistics_object_pages(limit=1, prefetch=prefetch)
+            assert type(next(pages)[0]) is Piece
+            assert [len(page) for page in pages] == [1, 1]
+            assert [r.qs.get("page") for r in m.request_history][-3:] == [
+                None,
+                None,
+                ["3"],
+            ]
+
+        # a server that ignores limit and offset returns the same page again
+        m.get(
+            "http://localhost:8080/companies/test/los",
+            text="[" + ",".join([pieces_json[1:-1]] * 2) + "]",
+        )
+        for prefetch in (True, False):
+            pages = self.client.iter_logistics_object_pages(limit=2, prefetch=prefetch)
+            assert [len(page) for page in pages] == [2]
+        assert m.request_history[-1].qs["offset"] == ["2"]
+
+        m.get("http://localhost:8080/companies/test/los?limit=2&offset=0", text="[]")
+        assert list(self.client.iter_logistics_object_pages(limit=2)) == []
+        with pytest.raises(ValueError):
+            next(self.client.iter_logistics_object_pages(limit=0))
+
     @requests_mock.mock()
     def test_client_get_all_pieces(self, m):
         m.get(
@@ -127,6 +319,12 @@ class TestONERecordClient(unittest.TestCase):
         assert len(logistics_objects) > 0
         assert type(logistics_objects.pop()) is Piece
 
+        lazy_logistics_objects = self.client.get_lazy_logistics_objects(
+            logistics_object_type=LogisticsObjectType.PIECE
+        )
+        assert lazy_logistics_objects[0].model_class is Piece
+        assert lazy_logistics_objects[0].gross_weight.value == 3.922
+
     @requests_mock.mock()
     def test_client_create_event(self, m):
         m.post(
@@ -226,3 +424,245 @@ class TestONERecordClient(unittest.TestCase):
             self.client.update_logistics_object(updated_logistics_object=updated_piece)
             is True
         )
+
+    @requests_mock.mock()
+    def test_update_logistics_object_from_baseline(self, m):
+        uri = "http://localhost:8080/companies/test/los/piece-1260233867"
+        m.get(
+            uri,
+            text=text_get_piece_callback,
+            status_code=200,
+            headers={"Latest-Revision": "3"},
+        )
+        m.patch(uri, [{"status_code": 204}, {"status_code": 409}, {"status_code": 204}])
+        client = ONERecordClient(company_identifier="test", track_baseline=True)
+
+        piece: Piece = client.get_logistics_object_by_uri(uri=uri)
+        piece.goods_description = "crate of Koelsch beer"
+        assert client.update_logistics_object(updated_logistics_object=piece) is True
+        assert [r.method for r in m.request_history] == ["GET", "PATCH"]
+        assert (
+            m.request_history[1].json()[
+                "https://onerecord.iata.org/api/PatchRequest#revision"
+            ]
+            == "3"
+        )
+
+        piece.goods_description = "keg of Koelsch beer"
+        assert client.update_logistics_object(updated_logistics_object=piece) is True
+        assert [r.method for r in m.request_history] == [
+            "GET",
+            "PATCH",
+            "PATCH",
+            "GET",
+            "PATCH",
+        ]
+        assert (
+            m.request_history[2].json()[
+                "https://onerecord.iata.org/api/PatchRequest#revision"
+            ]
+            == "4"
+        )
+        client.close()
+
+    @requests_mock.mock()
+    def test_update_logistics_object_nested_patch_paths(self, m):
+        uri = "http://localhost:8080/companies/test/los/piece-1260233867"
+        m.get(uri, text=text_get_piece_callback, status_code=200)
+        m.patch(uri, status_code=204)
+        for nested_patch_paths, predicate in (
+            (False, "https://onerecord.iata.org/Piece#grossWeight"),
+            (
+                True,
+                "/https:~1~1onerecord.iata.org~1Piece#grossWeight"
+                "/https:~1~1onerecord.iata.org~1Value#value",
+            ),
+        ):
+            client = ONERecordClient(
+                company_identifier="test", nested_patch_paths=nested_patch_paths
+            )
+            piece: Piece = client.get_logistics_object_by_uri(uri=uri)
+            piece.gross_weight.value = 4.922
+            assert client.update_logistics_object(piece) is True
+            operations = m.last_request.json()[
+                "https://onerecord.iata.org/api/PatchRequest#operations"
+            ]
+            assert {
+                operation["https://onerecord.iata.org/api/Operation#p"]
+                for operation in operations
+            } == {predicate}
+            client.close()
+
+    @requests_mock.mock()
+    def test_update_logistics_object_coalesced(self, m):
+        uri = "http://localhost:8080/companies/test/los/piece-1260233867"
+        m.get(uri, text=text_get_piece_callback, status_code=200)
+        m.patch(uri, status_code=204)
+        client = ONERecordClient(
+            company_identifier="test", track_baseline=True, coalesce_window=0.05
+        )
+        piece: Piece = client.get_logistics_object_by_uri(uri=uri)
+        other: Piece = client.get_logistics_object_by_uri(uri=uri)
+        piece.goods_description = "crate of Koelsch beer"
+        other.gross_weight.value = 4.922
+
+        results: list = []
+        threads = [
+            threading.Thread(
+                target=lambda lo: results.append(client.update_logistics_object(lo)),
+                args=(lo,),
+            )
+            for lo in (piece, other)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [True, True]
+        patches = [r for r in m.request_history if r.method == "PATCH"]
+        assert len(patches) == 1
+        assert (
+            len(
+                patches[0].json()[
+                    "https://onerecord.iata.org/api/PatchRequest#operations"
+                ]
+            )
+            == 4
+        )
+        assert piece._revision == other._revision == 1
+        client.close()
+
+    @requests_mock.mock()
+    def test_submit_logistics_object_update(self, m):
+        uri = "http://localhost:8080/companies/test/los/piece-1260233867"
+        m.get(uri, text=text_get_piece_callback, status_code=200)
+        m.patch(uri, status_code=204)
+        client = ONERecordClient(
+            company_identifier="test", track_baseline=True, coalesce_window=0.05
+        )
+        piece: Piece = client.get_logistics_object_by_uri(uri=uri)
+        other: Piece = client.get_logistics_object_by_uri(uri=uri)
+
+        started = time.monotonic()
+        piece.goods_description = "crate of Koelsch beer"
+        first = client.submit_logistics_object_update(piece)
+        piece.gross_weight.value = 4.922
+        second = client.submit_logistics_object_update(piece)
+        other.upid = "4711"
+        third = client.submit_logistics_object_update(other)
+        assert not first.done()
+        assert [f.result(5) for f in (first, second, third)] == [True, True, True]
+        assert time.monotonic() - started < 1
+        patches = [r for r in m.request_history if r.method == "PATCH"]
+        assert len(patches) == 1
+        assert (
+            len(
+                patches[0].json()[
+                    "https://onerecord.iata.org/api/PatchRequest#operations"
+                ]
+            )
+            == 5
+        )
+        assert piece._revision == other._revision == 1
+
+        with pytest.raises(ValueError):
+            client.submit_logistics_object_update(piece).result()
+        client.close()
+
+    @requests_mock.mock()
+    def test_retry_policy(self, m):
+        uri = "http://localhost:8080/companies/test/los/piece-1260233867"
+        m.get(
+            uri,
+            [
+                {"status_code": 503, "headers": {"Retry-After": "0"}},
+                {"status_code": 502},
+                {"status_code": 200, "text": text_get_piece_callback},
+            ],
+        )
+        m.post(f"{uri}/events", [{"status_code": 500}, {"status_code": 201}])
+        client = ONERecordClient(
+            company_identifier="test", retry_policy=RetryPolicy(backoff_factor=0)
+        )
+
+        assert type(client.get_logistics_object_by_uri(uri=uri)) is Piece
+        assert m.call_count == 3
+
+        event: Event = Event(
+            **{
+                "event_type_indicator": "Actual",
+                "event_code": "FOH",
+                "date_time": datetime.utcnow(),
+            }
+        )
+        with pytest.raises(ONERecordClientException):
+            client.create_event(logistics_object_uri=uri, event=event)
+        assert m.call_count == 4
+
+        m.post(f"{uri}/events", [{"status_code": 500}, {"status_code": 201}])
+        assert (
+            client.create_event(
+                logistics_object_uri=uri, event=event, idempotency_key="foh-4711"
+            )
+            is True
+        )
+        assert m.call_count == 6
+        assert m.last_request.headers["Idempotency-Key"] == "foh-4711"
+        client.close()
+
+    @requests_mock.mock()
+    def test_rate_limiter(self, m):
+        uri = "http://localhost:8080/companies/test/los/piece-1260233867"
+        m.get(uri, text=text_get_piece_callback)
+        waited: list[float] = []
+        rate_limiter = RateLimiter(rate=1, capacity=1, sleep=waited.append)
+        client = ONERecordClient(company_identifier="test", rate_limiter=rate_limiter)
+        for _ in range(3):
+            client.get_logistics_object_by_uri(uri=uri)
+        assert m.call_count == 3
+        assert len(waited) == 2
+        assert waited[1] > waited[0] > 0.9
+        client.close()
+
+    @requests_mock.mock()
+    def test_circuit_breaker(self, m):
+        uri = "http://localhost:8080/companies/test/los/piece-1260233867"
+        m.get(uri, exc=requests.exceptions.ConnectTimeout)
+        circuit_breaker = CircuitBreaker(failure_threshold=2)
+        client = ONERecordClient(
+            company_identifier="test",
+            circuit_breaker=circuit_breaker,
+            retry_policy=RetryPolicy(backoff_factor=0),
+        )
+        with pytest.raises(CircuitBreakerOpenException):
+            client.get_logistics_object_by_uri(uri=uri)
+        assert m.call_count == 2
+        assert circuit_breaker.get_state("localhost:8080") is CircuitBreakerState.OPEN
+        with pytest.raises(CircuitBreakerOpenException):
+            client.get_logistics_object_by_uri(uri=uri)
+        assert m.call_count == 2
+        client.close()
+
+    @requests_mock.mock()
+    def test_circuit_breaker_releases_probe(self, m):
+        uri = "http://localhost:8080/companies/test/los/piece-1260233867"
+        m.get(
+            uri,
+            [
+                {"exc": requests.exceptions.ConnectTimeout},
+                {"exc": KeyboardInterrupt},
+                {"text": text_get_piece_callback},
+            ],
+        )
+        circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        client = ONERecordClient(
+            company_identifier="test", circuit_breaker=circuit_breaker
+        )
+        with pytest.raises(requests.exceptions.ConnectTimeout):
+            client.get_logistics_object_by_uri(uri=uri)
+        with pytest.raises(KeyboardInterrupt):
+            client.get_logistics_object_by_uri(uri=uri)
+        # the interrupted probe did not keep the circuit half-open for good
+        assert type(client.get_logistics_object_by_uri(uri=uri)) is Piece
+        assert circuit_breaker.get_state("localhost:8080") is CircuitBreakerState.CLOSED
+        client.close()
@@ -0,0 +1,163 @@
+import threading
+
+import pytest
+
+from onerecord.coalescing import PatchCoalescer
+from onerecord.models.api import PatchRequest
+from onerecord.models.cargo import Piece, Value
+from onerecord.utils import generate_patch_request, merge_patch_requests
+
+PIECE_ID = "http://localhost:8080/companies/test/los/piece-1260233867"
+
+
+def _piece(**kwargs) -> Piece:
+    return Piece(
+        id=PIECE_ID,
+        type=["https://onerecord.iata.org/Piece"],
+        company_identifier="test",
+        gross_weight=Value(value=3.922, unit="KGM"),
+        **kwargs,
+    )
+
+
+def _patch_request(original: Piece, updated: Piece) -> PatchRequest:
+    return generate_patch_request(original, updated, "test")
+
+
+def _operations(patch_request: PatchRequest) -> list[tuple]:
+    return [
+        (operation.op, operation.p, operation.o.value)
+        for operation in patch_request.operations
+    ]
+
+
+def test_merge_patch_requests():
+    with pytest.raises(ValueError):
+        merge_patch_requests([])
+    a = _piece(goods_description="six pack", shipping_marks=["a"])
+    b = _piece(goods_description="crate", shipping_marks=["a"])
+    c = _piece(goods_description="six pack", shipping_marks=["a", "b"])
+    merged = merge_patch_requests([_patch_request(a, b), _patch_request(b, c)])
+    # the change of the goods description is reverted by the second request
+    assert _operations(merged) == [
+        ("add", "https://onerecord.iata.org/Piece#shippingMarks", "b"),
+    ]
+    assert merged.revision == _patch_request(a, b).revision
+
+    duplicate = merge_patch_requests([_patch_request(a, c), _patch_request(a, c)])
+    assert _operations(duplicate) == _operations(_patch_request(a, c))
+
+    other = b.copy(update={"id": "http://localhost:8080/companies/test/los/piece-1"})
+    with pytest.raises(ValueError):
+        merge_patch_requests([_patch_request(a, b), _patch_request(other, other)])
+
+
+def test_merge_patch_requests_conflicting_values():
+    a = _piece(goods_description="six pack", shipping_marks=["a"])
+    b = _piece(goods_description="package", shipping_marks=["a", "b"])
+    c = _piece(goods_description="keg", shipping_marks=["a", "c"])
+    # both updates of the same revision set the single goods description
+    with pytest.raises(ValueError):
+        merge_patch_requests([_patch_request(a, b), _patch_request(a, c)])
+
+    d = _piece(goods_description="six pack", shipping_marks=["a", "c"])
+    merged = merge_patch_requests([_patch_request(a, b), _patch_request(a, d)])
+    assert ("add", "https://onerecord.iata.org/Piece#shippingMarks", "c") in (
+        _operations(merged)
+    )
+
+    e = _piece(goods_description="six pack", shipping_marks=["a"])
+    e.gross_weight.unit = "LBR"
+    f = _piece(goods_description="six pack", shipping_marks=["a"])
+    f.gross_weight.unit = "TNE"
+    with pytest.raises(ValueError):
+        merge_patch_requests(
+            [
+                generate_patch_request(a, e, "test", nested_paths=True),
+                generate_patch_request(a, f, "test", nested_paths=True),
+            ]
+        )
+
+
+def test_patch_coalescer():
+    with pytest.raises(ValueError):
+        PatchCoalescer(send=lambda patch_request: True, window=-1)
+    sent: list[PatchRequest] = []
+    coalescer = PatchCoalescer(send=lambda pr: sent.append(pr) or True, window=60)
+    a = _piece(goods_description="six pack")
+    b = _piece(goods_description="crate")
+    c = _piece(goods_description="keg")
+    applied: list[PatchRequest] = []
+    first = coalescer.submit(_patch_request(a, b), key="x")
+    # replaces the first PatchRequest of the same key
+    second = coalescer.submit(_patch_request(a, c), key="x", on_success=applied.append)
+    third = coalescer.submit(_patch_request(a, c))
+    assert not first.done()
+    coalescer.flush()
+    assert first.result() is second.result() is third.result() is True
+    assert len(sent) == 1
+    assert applied == sent
+    assert [op for op, _, _ in _operations(sent[0])] == ["del", "add"]
+
+    # nothing is sent if all changes cancel each other out
+    assert coalescer.submit(_patch_request(a, b)) is not None
+    coalescer.submit(_patch_request(b, a))
+    coalescer.flush(PIECE_ID)
+    assert len(sent) == 1
+
+
+def test_patch_coalescer_window():
+    sent: list[PatchRequest] = []
+    done = threading.Event()
+
+    def send(patch_request: PatchRequest) -> bool:
+        sent.append(patch_request)
+        done.set()
+        return True
+
+    coalescer = PatchCoalescer(send=send, window=0.01)
+    a = _piece(goods_description="six pack", shipping_marks=["a"])
+    futures = [
+        coalescer.submit(
+            _patch_request(
+                a, _piece(goods_description="six pack", shipping_marks=["a", mark])
+            )
+        )
+        for mark in ("b", "c")
+    ]
+    assert done.wait(5)
+    assert [future.result(5) for future in futures] == [True, True]
+    assert len(sent) == 1
+    assert len(sent[0].operations) == 2
+
+
+def test_patch_coalescer_conflicting_values():
+    sent: list[PatchRequest] = []
+    coalescer = PatchCoalescer(send=lambda pr: sent.append(pr) or True, window=60)
+    a = _piece(goods_description="six pack")
+    futures = [
+        coalescer.submit(_patch_request(a, _piece(goods_description=description)))
+        for description in ("package", "keg")
+    ]
+    coalescer.flush()
+    assert [future.result() for future in futures] == [True, True]
+    assert [_operations(patch_request)[-1][2] for patch_request in sent] == [
+        "package",
+        "keg",
+    ]
+
+
+def test_patch_coalescer_exception():
+    def send(patch_request: PatchRequest) -> bool:
+        raise RuntimeError("unavailable")
+
+    coalescer = PatchCoalescer(send=send, window=60)
+    a = _piece(goods_description="six pack")
+    futures = [
+        coalescer.submit(_patch_request(a, _piece(goods_description=description)))
+        for description in ("crate", "keg")
+    ]
+    coalescer.flush()
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result()
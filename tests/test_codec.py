@@ -0,0 +1,61 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from onerecord import codec
+from onerecord.models.cargo import Event
+from onerecord.utils import json_to_events, thing_to_json
+
+
+@pytest.fixture(params=["json", "orjson"])
+def json_codec(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    previous_codec = codec.get_codec()
+    codec.set_codec(request.param)
+    yield codec.get_codec()
+    codec.set_codec(previous_codec)
+
+
+def test_set_codec():
+    with pytest.raises(ValueError):
+        codec.set_codec("yaml")
+
+
+def test_codec_roundtrip(json_codec):
+    data = {
+        "@type": ["https://onerecord.iata.org/Piece"],
+        "value": 3.922,
+        "k": "Kölsch",
+    }
+    assert json_codec.loads(json_codec.dumps(data)) == data
+    assert codec.loads(codec.dumps(data).decode("utf-8")) == data
+    assert codec.loads(memoryview(codec.dumps(data))) == data
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b'{"@type": ')
+
+
+def test_codec_models(json_codec):
+    event: Event = Event(
+        **{
+            "@type": ["https://onerecord.iata.org/Event"],
+            "event_type_indicator": "Actual",
+            "event_code": "FOH",
+            "date_time": datetime(2022, 10, 10, 19, 49, 10),
+        }
+    )
+    event_json: bytes = thing_to_json(event)
+    assert isinstance(event_json, bytes)
+    assert json.loads(event_json)["https://onerecord.iata.org/Event#dateTime"] == (
+        "2022-10-10T19:49:10Z"
+    )
+    assert json.loads(event.json(exclude_none=True, by_alias=True)) == json.loads(
+        event_json
+    )
+    for parsed_event in (
+        json_to_events(b"[" + event_json + b"]")[0],
+        Event.parse_raw(event_json),
+    ):
+        assert parsed_event.event_code == "FOH"
+        assert parsed_event.date_time.replace(tzinfo=None) == event.date_time
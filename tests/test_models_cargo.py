@@ -1,10 +1,12 @@
+import copy
 import datetime
+import pickle
 
 import pytest
 from pydantic import ValidationError
 
 from onerecord.models.api import Notification, Subscription
-from onerecord.models.cargo import Location, Waybill
+from onerecord.models.cargo import Location, Piece, Value, Waybill
 from onerecord.models.enums import LogisticsObjectType, NotificationEventType
 
 
@@ -70,3 +72,132 @@ def test_create_waybill():
         waybill_prefix="111",
     )
     assert waybill.company_identifier is not None
+
+
+def test_track_changes():
+    piece = Piece(
+        company_identifier="cgnbeerbrewery",
+        goods_description="six pack of Koelsch beer",
+        gross_weight=Value(value=3.922, unit="KGM"),
+        shipping_marks=["a"],
+        contained_pieces=[
+            Piece(
+                company_identifier="cgnbeerbrewery",
+                goods_description="Koelsch beer",
+                gross_weight=Value(value=0.5, unit="KGM"),
+            )
+        ],
+    )
+    assert piece.changed_fields() is None
+    piece.goods_description = "crate of Koelsch beer"
+    assert piece.changed_fields() is None
+
+    piece.track_changes()
+    assert piece.changed_fields() == set()
+    piece.gross_weight.value = 4.0
+    assert piece.changed_fields() == {"gross_weight"}
+    piece.shipping_marks.append("b")
+    piece.contained_pieces[0].gross_weight.unit = "LBR"
+    assert piece.changed_fields() == {
+        "gross_weight",
+        "shipping_marks",
+        "contained_pieces",
+    }
+
+    piece.track_changes()
+    piece.upid = "4711"
+    piece.iot_devices = []
+    piece.iot_devices.extend([])
+    assert piece.changed_fields() == {"upid", "iot_devices"}
+    assert piece.shipping_marks == ["a", "b"]
+
+    piece_copy = piece.copy(deep=True, update={"goods_description": "keg"})
+    assert piece_copy.changed_fields() == {"upid", "iot_devices", "goods_description"}
+    piece_copy.shipping_marks.append("c")
+    assert "shipping_marks" in piece_copy.changed_fields()
+    assert "shipping_marks" not in piece.changed_fields()
+    assert piece.shipping_marks == ["a", "b"]
+    assert pickle.loads(pickle.dumps(piece)) == piece
+
+
+def test_track_changes_references():
+    gross_weight = Value(value=3.922, unit="KGM")
+    piece = Piece(
+        company_identifier="cgnbeerbrewery",
+        goods_description="six pack of Koelsch beer",
+        gross_weight=gross_weight,
+        shipping_marks=["a"],
+    )
+    other_piece = Piece(
+        company_identifier="cgnbeerbrewery",
+        goods_description="crate of Koelsch beer",
+        gross_weight=Value(value=10.0, unit="KGM"),
+    )
+    other_piece.gross_weight = piece.gross_weight
+    shipping_marks = piece.shipping_marks
+    piece.track_changes()
+    other_piece.track_changes()
+
+    shipping_marks.append("b")
+    assert piece.shipping_marks == ["a", "b"]
+    assert piece.changed_fields() == {"shipping_marks"}
+
+    # a nested Thing in two tracked parents reports its changes to both
+    piece.gross_weight.value = 4.0
+    assert piece.changed_fields() == {"shipping_marks", "gross_weight"}
+    assert other_piece.changed_fields() == {"gross_weight"}
+
+    # a replaced Thing no longer reports to the parent
+    other_piece.gross_weight = Value(value=10.0, unit="KGM")
+    other_piece.track_changes()
+    piece.gross_weight.value = 5.0
+    assert other_piece.changed_fields() == set()
+
+    # an assigned plain list stays the same list and counts as changed
+    shipping_marks = ["c"]
+    piece.track_changes()
+    piece.shipping_marks = shipping_marks
+    shipping_marks.append("d")
+    assert piece.shipping_marks is shipping_marks
+    piece.track_changes()
+    assert piece.changed_fields() == {"shipping_marks"}
+
+
+@pytest.mark.parametrize(
+    "copy_piece",
+    [
+        lambda piece: piece.copy(),
+        lambda piece: piece.copy(deep=True),
+        copy.copy,
+        copy.deepcopy,
+        lambda piece: pickle.loads(pickle.dumps(piece)),
+    ],
+)
+def test_track_changes_copies(copy_piece):
+    piece = Piece(
+        company_identifier="cgnbeerbrewery",
+        goods_description="six pack of Koelsch beer",
+        gross_weight=Value(value=3.922, unit="KGM"),
+        shipping_marks=["a"],
+    )
+    piece.track_changes()
+    piece_copy = copy_piece(piece)
+    assert piece_copy.changed_fields() == set()
+
+    piece_copy.shipping_marks.append("c")
+    piece_copy.gross_weight.unit = "LBR"
+    assert piece_copy.changed_fields() == {"shipping_marks", "gross_weight"}
+    assert piece.changed_fields() == set()
+    assert piece.shipping_marks == ["a"]
+    assert piece.gross_weight.unit == "KGM"
+
+    piece.shipping_marks.append("b")
+    piece.gross_weight.value = 4.0
+    assert piece.changed_fields() == {"shipping_marks", "gross_weight"}
+    assert piece_copy.shipping_marks == ["a", "c"]
+    assert piece_copy.gross_weight.value == 3.922
+
+    nested_copy = copy.deepcopy(piece.gross_weight)
+    piece.track_changes()
+    nested_copy.value = 5.0
+    assert piece.changed_fields() == set()
@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from onerecord.ratelimit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        with self.lock:
+            self.now += seconds
+
+
+def test_token_bucket():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0.5
+    assert clock.now == 0.5
+    clock.now += 10
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0.5
+
+
+def test_rate_limiter_per_host_and_method():
+    clock = FakeClock()
+    rate_limiter = RateLimiter(rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+    rate_limiter.set_limit(rate=10, capacity=1, host="partner-a:8080")
+    rate_limiter.set_limit(rate=2, capacity=1, host="partner-a:8080", method="post")
+
+    assert rate_limiter.acquire("GET", "http://partner-a:8080/companies/a/los") == 0
+    assert rate_limiter.acquire("GET", "http://partner-a:8080/companies/a/los") == 0.1
+    assert rate_limiter.acquire("POST", "http://partner-a:8080/companies/a/los") == 0
+    assert rate_limiter.acquire("POST", "http://partner-a:8080/companies/a/los") == 0.5
+
+    assert rate_limiter.acquire("GET", "http://partner-b:8080/companies/b/los") == 0
+    assert rate_limiter.acquire("GET", "http://partner-c:8080/companies/c/los") == 0
+    assert rate_limiter.acquire("GET", "http://partner-b:8080/companies/b/los") > 0
+
+    assert RateLimiter().acquire("GET", "http://partner-a:8080/companies/a") == 0
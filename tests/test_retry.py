@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from onerecord.retry import RetryPolicy
+
+
+def make_response(status_code: int, headers: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+def test_retry_policy_should_retry():
+    with pytest.raises(ValueError):
+        RetryPolicy(max_retries=-1)
+    retry_policy = RetryPolicy(max_retries=2)
+    assert retry_policy.should_retry(0, response=make_response(503)) is True
+    assert retry_policy.should_retry(0, response=make_response(404)) is False
+    assert retry_policy.should_retry(2, response=make_response(503)) is False
+    assert retry_policy.should_retry(1, exception=requests.ConnectionError()) is True
+    assert retry_policy.should_retry(1, exception=ValueError()) is False
+
+    retry_policy = RetryPolicy(max_retry_after=60)
+    response = make_response(429, {"Retry-After": "60"})
+    assert retry_policy.should_retry(0, response=response) is True
+    response = make_response(503, {"Retry-After": "86400"})
+    assert retry_policy.should_retry(0, response=response) is False
+    assert retry_policy.get_backoff(0, response=response) == 60
+
+
+def test_retry_policy_is_idempotent():
+    retry_policy = RetryPolicy()
+    assert retry_policy.is_idempotent("GET") is True
+    assert retry_policy.is_idempotent("POST") is False
+    assert (
+        retry_policy.is_idempotent("PATCH", {"Accept": "application/ld+json"}) is False
+    )
+    assert retry_policy.is_idempotent("POST", {"Idempotency-Key": "4711"}) is True
+
+
+def test_retry_policy_backoff():
+    retry_policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+    assert retry_policy.get_backoff(0) == 1
+    assert retry_policy.get_backoff(2) == 4
+    assert retry_policy.get_backoff(10) == 5
+
+    retry_policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+    assert all(0 <= retry_policy.get_backoff(3) <= 5 for _ in range(100))
+
+    response = make_response(429, {"Retry-After": "7"})
+    assert retry_policy.get_backoff(0, response=response) == 7
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+    response = make_response(503, {"Retry-After": format_datetime(retry_at)})
+    assert 50 < retry_policy.get_backoff(0, response=response) <= 60
+
+    response = make_response(500, {"Retry-After": "7"})
+    assert retry_policy.get_backoff(0, response=response) <= 1
@@ -1,13 +1,40 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from json import JSONDecodeError
 
 import pytest
+from pydantic import ValidationError
 
-from onerecord.models.api import PatchRequest
-from onerecord.models.cargo import LogisticsObject, Piece
+from onerecord.models.api import Notification, PatchRequest
+from onerecord.models.cargo import (
+    Address,
+    Event,
+    LogisticsObject,
+    Piece,
+    PieceDg,
+    Value,
+)
+from onerecord.models.enums import EventTypeIndicator
 from onerecord.utils import (
+    ONE_RECORD_CONTEXT,
+    apply_patch_request,
+    construct_thing,
+    dict_to_logistics_object,
+    dict_to_thing,
+    expand_json_ld,
     generate_patch_request,
+    get_class_by_type,
+    intern_iri,
+    iter_json_array,
+    iter_json_to_logistics_objects,
+    iter_logistics_object_chunks_parallel,
+    json_to_events,
+    json_to_lazy_logistics_objects,
     json_to_logistics_object,
     json_to_logistics_objects,
+    thing_to_json,
+    validate_thing,
 )
 
 
@@ -42,6 +69,364 @@ def test_json_to_logistics_objects():
     assert len(logistics_objects) == 2
 
 
+def test_json_to_logistics_objects_interned_iris():
+    logistics_objects_json: str = '[{"@id":"http://localhost:8080/companies/cgnbeerbrewery/los/piece-1","@type":["https://onerecord.iata.org/Piece","https://onerecord.iata.org/LogisticsObject"],"https://onerecord.iata.org/Piece#grossWeight":{"@type":["https://onerecord.iata.org/Value"],"https://onerecord.iata.org/Value#value":3.922,"https://onerecord.iata.org/Value#unit":"KGM"},"https://onerecord.iata.org/LogisticsObject#companyIdentifier":"http://localhost:8080/companies/cgnbeerbrewery","https://onerecord.iata.org/Piece#goodsDescription":"six pack of Koelsch beer"}]'
+    for validate in (True, False):
+        piece_1, piece_2 = (
+            json_to_logistics_objects(
+                logistics_objects_json=logistics_objects_json, validate=validate
+            )[0]
+            for _ in range(2)
+        )
+        assert piece_1.type[0] is piece_2.type[0]
+        assert piece_1.type[0] is intern_iri("https://onerecord.iata.org/Piece")
+        assert piece_1.gross_weight.type[0] is piece_2.gross_weight.type[0]
+        assert piece_1.company_identifier is piece_2.company_identifier
+        assert piece_1.id == piece_2.id
+
+
+def test_json_to_logistics_objects_from_buffers():
+    logistics_objects_json: bytes = '[{"@type":["https://onerecord.iata.org/Piece"],"https://onerecord.iata.org/Piece#grossWeight":{"@type":["https://onerecord.iata.org/Value"],"https://onerecord.iata.org/Value#value":3.922,"https://onerecord.iata.org/Value#unit":"KGM"},"https://onerecord.iata.org/LogisticsObject#companyIdentifier":"cgnbeerbrewery","https://onerecord.iata.org/Piece#goodsDescription":"six pack of Kölsch beer"}]'.encode(
+        "utf-8"
+    )
+    for buffer in (
+        logistics_objects_json,
+        bytearray(logistics_objects_json),
+        memoryview(logistics_objects_json),
+    ):
+        pieces = json_to_logistics_objects(logistics_objects_json=buffer)
+        assert pieces[0].goods_description == "six pack of Kölsch beer"
+    chunks = [
+        memoryview(logistics_objects_json)[i : i + 7]
+        for i in range(0, len(logistics_objects_json), 7)
+    ]
+    assert (
+        list(iter_json_to_logistics_objects(chunks))[0].goods_description
+        == "six pack of Kölsch beer"
+    )
+
+
+def test_json_to_logistics_object_without_validation():
+    logistics_object_json: str = '{"@id": "http://localhost:8080/companies/cgnbeerbrewery/los/piece-1261620145", "@type": ["https://onerecord.iata.org/Piece", "https://onerecord.iata.org/LogisticsObject"], "https://onerecord.iata.org/Piece#grossWeight": {"@id": "_:1957521880", "@type": [ "https://onerecord.iata.org/Value"], "https://onerecord.iata.org/Value#value": 3.922, "https://onerecord.iata.org/Value#unit": "KGM"}, "https://onerecord.iata.org/LogisticsObject#revision": 2, "https://onerecord.iata.org/LogisticsObject#companyIdentifier": "http://localhost:8080/companies/cgnbeerbrewery", "https://onerecord.iata.org/Piece#goodsDescription": "six pack of Koelsch beer"}'
+    piece = json_to_logistics_object(
+        logistics_object_json=logistics_object_json, validate=False
+    )
+    assert type(piece) is Piece
+    assert type(piece.gross_weight) is Value
+    assert piece.gross_weight.value == 3.922
+    assert piece.contained_pieces is None
+    assert piece._revision == 2
+    assert piece == json_to_logistics_object(
+        logistics_object_json=logistics_object_json
+    )
+    assert validate_thing(piece) == piece
+    assert validate_thing(piece)._revision == 2
+
+    invalid_piece = construct_thing(
+        Piece, {"company_identifier": "cgnbeerbrewery", "gross_weight": "heavy"}
+    )
+    assert invalid_piece.gross_weight == "heavy"
+    with pytest.raises(ValidationError):
+        validate_thing(invalid_piece)
+
+
+def test_json_to_logistics_objects_parallel():
+    logistics_objects_json: str = json.dumps(
+        [
+            {
+                "@id": f"http://localhost:8080/companies/cgnbeerbrewery/los/piece-{i}",
+                "@type": ["https://onerecord.iata.org/Piece"],
+                "https://onerecord.iata.org/LogisticsObject#revision": i,
+                "https://onerecord.iata.org/LogisticsObject#companyIdentifier": "cgnbeerbrewery",
+                "https://onerecord.iata.org/Piece#goodsDescription": "six pack of Koelsch beer",
+                "https://onerecord.iata.org/Piece#grossWeight": {
+                    "@type": ["https://onerecord.iata.org/Value"],
+                    "https://onerecord.iata.org/Value#value": 3.922,
+                    "https://onerecord.iata.org/Value#unit": "KGM",
+                },
+            }
+            for i in range(10)
+        ]
+    )
+    pieces = json_to_logistics_objects(
+        logistics_objects_json=logistics_objects_json, max_workers=2
+    )
+    assert pieces == json_to_logistics_objects(
+        logistics_objects_json=logistics_objects_json
+    )
+    assert [piece._revision for piece in pieces] == list(range(10))
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        chunks = list(
+            iter_logistics_object_chunks_parallel(
+                logistics_objects_json,
+                chunk_size=3,
+                ordered=False,
+                executor=executor,
+            )
+        )
+    assert sorted(len(chunk) for chunk in chunks) == [1, 3, 3, 3]
+    assert sorted(piece._revision for chunk in chunks for piece in chunk) == list(
+        range(10)
+    )
+    assert list(iter_logistics_object_chunks_parallel("[]")) == []
+
+
+def test_json_to_lazy_logistics_objects():
+    logistics_objects_json: str = '[{"@id":"http://localhost:8080/companies/cgnbeerbrewery/los/piece-1261620145","@type":["https://onerecord.iata.org/Piece","https://onerecord.iata.org/LogisticsObject"],"https://onerecord.iata.org/Piece#grossWeight":{"@id":"_:1957521880","@type":["https://onerecord.iata.org/Value"],"https://onerecord.iata.org/Value#value":3.922,"https://onerecord.iata.org/Value#unit":"KGM"},"https://onerecord.iata.org/LogisticsObject#revision":2,"https://onerecord.iata.org/LogisticsObject#companyIdentifier":"http://localhost:8080/companies/cgnbeerbrewery","https://onerecord.iata.org/Piece#goodsDescription":"six pack of Koelsch beer","https://onerecord.iata.org/Piece#slac":"many"}]'
+    lazy_pieces = json_to_lazy_logistics_objects(
+        logistics_objects_json=logistics_objects_json
+    )
+    assert len(lazy_pieces) == 1
+    lazy_piece = lazy_pieces[0]
+    assert lazy_piece.model_class is Piece
+    assert lazy_piece.goods_description == "six pack of Koelsch beer"
+    assert lazy_piece.gross_weight.model_class is Value
+    assert lazy_piece.gross_weight.value == 3.922
+    assert lazy_piece.contained_pieces is None
+    assert lazy_piece._revision == 2
+    assert set(lazy_piece._values) == {
+        "goods_description",
+        "gross_weight",
+        "contained_pieces",
+    }
+    with pytest.raises(AttributeError):
+        lazy_piece.waybill_number
+    # invalid fields only fail when they are read
+    with pytest.raises(ValidationError):
+        lazy_piece.slac
+    with pytest.raises(ValidationError):
+        lazy_piece.to_thing()
+
+    del lazy_piece.raw["https://onerecord.iata.org/Piece#slac"]
+    piece = lazy_piece.to_thing()
+    assert type(piece) is Piece
+    assert piece._revision == 2
+
+
+def test_json_to_events_without_validation():
+    events_json: str = '[{"@id":"http://localhost:8080/companies/test/los/piece-1260233867/event-1150940089","@type":["https://onerecord.iata.org/Event"],"https://onerecord.iata.org/Event#dateTime":"2022-10-10T19:49:10Z","https://onerecord.iata.org/Event#linkedObject":{"@id":"http://localhost:8080/companies/test/los/piece-1260233867","@type":["https://onerecord.iata.org/Piece","https://onerecord.iata.org/LogisticsObject"],"https://onerecord.iata.org/LogisticsObject#companyIdentifier":"test"},"https://onerecord.iata.org/Event#eventTypeIndicator":"Actual","https://onerecord.iata.org/Event#eventCode":"FOH","https://onerecord.iata.org/Event#eventName":"Freight on Hand"}]'
+    events = json_to_events(events_json=events_json, validate=False)
+    assert type(events[0]) is Event
+    assert events[0].event_type_indicator == EventTypeIndicator.ACTUAL
+    assert events[0].date_time.year == 2022
+    assert type(events[0].linked_object) is Piece
+
+
+def test_get_class_by_type():
+    assert get_class_by_type("https://onerecord.iata.org/Piece") is Piece
+    assert get_class_by_type("https://onerecord.iata.org/Address") is Address
+    assert (
+        get_class_by_type(
+            [
+                "https://onerecord.iata.org/Piece",
+                "https://onerecord.iata.org/PieceDg",
+                "https://onerecord.iata.org/LogisticsObject",
+            ]
+        )
+        is PieceDg
+    )
+    assert (
+        get_class_by_type(["https://onerecord.iata.org/api/Notification"])
+        is Notification
+    )
+    assert get_class_by_type(["https://onerecord.iata.org/LogisticsObject"]) is None
+    assert get_class_by_type(["https://onerecord.iata.org/Beer"]) is None
+
+
+def test_dict_to_logistics_object_subclasses():
+    piece_dg = dict_to_logistics_object(
+        {
+            "@type": [
+                "https://onerecord.iata.org/Piece",
+                "https://onerecord.iata.org/PieceDg",
+            ],
+            "company_identifier": "cgnbeerbrewery",
+            "goods_description": "six pack of Koelsch beer",
+            "gross_weight": {"unit": "KGM", "value": 3.922},
+        }
+    )
+    assert type(piece_dg) is PieceDg
+    address = dict_to_thing(
+        {"@type": "https://onerecord.iata.org/Address", "city_code": "CGN"}
+    )
+    assert type(address) is Address
+
+
+def test_json_to_logistics_object_nested_subclasses():
+    piece_json: str = """{
+        "@type": ["https://onerecord.iata.org/Piece"],
+        "https://onerecord.iata.org/LogisticsObject#companyIdentifier": "cgnbeerbrewery",
+        "https://onerecord.iata.org/Piece#goodsDescription": "six pack of Koelsch beer",
+        "https://onerecord.iata.org/Piece#grossWeight": {"https://onerecord.iata.org/Value#value": 3.922, "https://onerecord.iata.org/Value#unit": "KGM"},
+        "https://onerecord.iata.org/Piece#containedPieces": [
+            {
+                "@type": ["https://onerecord.iata.org/PieceDg", "https://onerecord.iata.org/Piece"],
+                "https://onerecord.iata.org/LogisticsObject#companyIdentifier": "cgnbeerbrewery",
+                "https://onerecord.iata.org/Piece#goodsDescription": "lithium batteries",
+                "https://onerecord.iata.org/Piece#grossWeight": {"https://onerecord.iata.org/Value#value": 1.0, "https://onerecord.iata.org/Value#unit": "KGM"},
+                "https://onerecord.iata.org/PieceDg#allPackedInOneIndicator": true
+            }
+        ]
+    }"""
+    for validate in (True, False):
+        piece = json_to_logistics_object(
+            logistics_object_json=piece_json, validate=validate
+        )
+        assert type(piece) is Piece
+        piece_dg = piece.contained_pieces[0]
+        assert type(piece_dg) is PieceDg
+        assert piece_dg.all_packed_in_one_indicator is True
+        assert piece_dg.gross_weight.value == 1.0
+        validated_piece_dg = validate_thing(piece).contained_pieces[0]
+        assert type(validated_piece_dg) is PieceDg
+        assert validated_piece_dg.all_packed_in_one_indicator is True
+
+    invalid_piece_json: str = piece_json.replace(
+        '"https://onerecord.iata.org/PieceDg#allPackedInOneIndicator": true',
+        '"https://onerecord.iata.org/PieceDg#allPackedInOneIndicator": "maybe"',
+    )
+    with pytest.raises(ValidationError):
+        json_to_logistics_object(logistics_object_json=invalid_piece_json)
+
+
+def test_thing_to_json():
+    piece = Piece(
+        id="http://localhost:8080/companies/cgnbeerbrewery/los/piece-1",
+        type=["https://onerecord.iata.org/Piece"],
+        company_identifier="cgnbeerbrewery",
+        goods_description="six pack of Koelsch beer",
+        gross_weight=Value(value=3.922, unit="KGM"),
+        contained_pieces=[
+            PieceDg(
+                company_identifier="cgnbeerbrewery",
+                goods_description="lithium batteries",
+                gross_weight=Value(value=1.0, unit="KGM"),
+                all_packed_in_one_indicator=True,
+            )
+        ],
+        events=[
+            Event(
+                event_type_indicator=EventTypeIndicator.ACTUAL,
+                event_code="FOH",
+                date_time=datetime(2022, 10, 10, 19, 49, 10),
+            )
+        ],
+    )
+    patch_request = generate_patch_request(
+        piece, piece.copy(update={"goods_description": "Koelsch"}), "cgnbeerbrewery"
+    )
+    for thing in (piece, patch_request):
+        assert json.loads(thing_to_json(thing)) == json.loads(
+            thing.json(exclude_none=True, by_alias=True)
+        )
+    piece_dict = json.loads(thing_to_json(piece))
+    assert (
+        piece_dict["https://onerecord.iata.org/Piece#containedPieces"][0][
+            "https://onerecord.iata.org/PieceDg#allPackedInOneIndicator"
+        ]
+        is True
+    )
+    assert piece_dict["https://onerecord.iata.org/LogisticsObject#events"][0][
+        "https://onerecord.iata.org/Event#dateTime"
+    ] == ("2022-10-10T19:49:10Z")
+
+    compact_piece_json: bytes = thing_to_json(piece, compact=True)
+    assert len(compact_piece_json) < 0.6 * len(thing_to_json(piece))
+    compact_piece_dict = json.loads(compact_piece_json)
+    assert compact_piece_dict["@context"] == ONE_RECORD_CONTEXT
+    assert compact_piece_dict["@type"] == ["Piece"]
+    assert compact_piece_dict["Piece#grossWeight"]["Value#value"] == 3.922
+    assert expand_json_ld(compact_piece_dict).keys() == piece_dict.keys()
+    for validate in (True, False):
+        parsed_piece = json_to_logistics_object(compact_piece_json, validate=validate)
+        assert parsed_piece.type == piece.type
+        assert parsed_piece.gross_weight.value == piece.gross_weight.value
+        assert type(parsed_piece.contained_pieces[0]) is PieceDg
+        assert parsed_piece.events[0].event_code == "FOH"
+
+
+def test_expand_json_ld():
+    compact_dict: dict = {
+        "@context": [
+            {"@vocab": "https://onerecord.iata.org/"},
+            {"api": "https://onerecord.iata.org/api/", "weight": "Piece#grossWeight"},
+        ],
+        "@id": "piece-1",
+        "@type": "Piece",
+        "weight": {"@type": ["Value"], "Value#value": 3.922},
+        "api:LogisticsObjectRef#logisticsObjectId": "piece-1",
+        "https://onerecord.iata.org/Piece#goodsDescription": "six pack of Koelsch beer",
+    }
+    assert expand_json_ld(compact_dict) == {
+        "@id": "piece-1",
+        "@type": ["https://onerecord.iata.org/Piece"],
+        "https://onerecord.iata.org/Piece#grossWeight": {
+            "@type": ["https://onerecord.iata.org/Value"],
+            "https://onerecord.iata.org/Value#value": 3.922,
+        },
+        "https://onerecord.iata.org/api/LogisticsObjectRef#logisticsObjectId": "piece-1",
+        "https://onerecord.iata.org/Piece#goodsDescription": "six pack of Koelsch beer",
+    }
+    assert expand_json_ld(
+        {
+            "@context": ["https://onerecord.iata.org/ns/cargo", {"p": "Piece#"}],
+            "p:goodsDescription": "six pack of Koelsch beer",
+        },
+        context=ONE_RECORD_CONTEXT,
+    ) == {
+        "https://onerecord.iata.org/Piece#goodsDescription": "six pack of Koelsch beer"
+    }
+
+
+def test_json_to_logistics_object_remote_context():
+    piece_dict: dict = {
+        "@context": "https://onerecord.iata.org/ns/cargo",
+        "@id": "http://localhost:8080/companies/test/los/piece-1260233867",
+        "@type": ["https://onerecord.iata.org/Piece"],
+        "https://onerecord.iata.org/LogisticsObject#companyIdentifier": "test",
+        "https://onerecord.iata.org/Piece#goodsDescription": "six pack of Koelsch beer",
+        "https://onerecord.iata.org/Piece#grossWeight": {
+            "@type": ["https://onerecord.iata.org/Value"],
+            "https://onerecord.iata.org/Value#value": 3.922,
+            "https://onerecord.iata.org/Value#unit": "KGM",
+        },
+    }
+    for validate in (True, False):
+        piece = json_to_logistics_object(json.dumps(piece_dict), validate=validate)
+        assert type(piece) is Piece
+        assert piece.goods_description == "six pack of Koelsch beer"
+        assert piece.gross_weight.value == 3.922
+
+
+def test_iter_json_array():
+    json_array: str = (
+        '[{"a": [1, "x]},\\"y", {"b": null}]}, 12345, "K\u00f6lsch", [] ,{}]'
+    )
+    for chunk_size in (1, 3, 100):
+        chunks = [
+            json_array[i : i + chunk_size].encode()
+            for i in range(0, len(json_array), chunk_size)
+        ]
+        assert list(iter_json_array(chunks)) == json.loads(json_array)
+    assert list(iter_json_array([b"[", b" ]"])) == []
+    for invalid_json_array in ("[1,", '{"a": 1}', "[1 2]", '[{"a":}]'):
+        with pytest.raises(JSONDecodeError):
+            list(iter_json_array([invalid_json_array]))
+
+
+def test_iter_json_to_logistics_objects():
+    logistics_objects_json: str = '[{"@id":"http://localhost:8080/companies/cgnbeerbrewery/piece-1153586115","@type":["https://onerecord.iata.org/Piece","https://onerecord.iata.org/LogisticsObject"],"https://onerecord.iata.org/Piece#grossWeight":{"@id":"_:1683317490","@type":["https://onerecord.iata.org/Value"],"https://onerecord.iata.org/Value#value":3.922,"https://onerecord.iata.org/Value#unit":"KGM"},"https://onerecord.iata.org/LogisticsObject#revision":0,"https://onerecord.iata.org/LogisticsObject#companyIdentifier":"http://localhost:8080/companies/cgnbeerbrewery","https://onerecord.iata.org/Piece#goodsDescription":"six pack of Koelsch beer"},{"@id":"http://localhost:8080/companies/cgnbeerbrewery/los/beer-1261620145","@type":["https://onerecord.iata.org/Beer"]}]'
+    chunks = (
+        logistics_objects_json[i : i + 64].encode()
+        for i in range(0, len(logistics_objects_json), 64)
+    )
+    logistics_objects = iter_json_to_logistics_objects(chunks)
+    assert type(next(logistics_objects)) is Piece
+    with pytest.raises(StopIteration):
+        next(logistics_objects)
+
+
 def test_generate_patch_request_replace():
     piece_a: Piece = Piece(
         **{
@@ -150,3 +535,235 @@ def test_generate_patch_request_replace_add():
     )
     assert patch_request is not None
     assert len(patch_request.operations) == 3
+
+
+def test_generate_patch_request_nested():
+    piece_a: Piece = Piece(
+        **{
+            "@id": "http://localhost:8080/companies/cgnbeerbrewery/piece-1153586115",
+            "@type": [
+                "https://onerecord.iata.org/Piece",
+                "https://onerecord.iata.org/LogisticsObject",
+            ],
+            "company_identifier": "test",
+            "goods_description": "six pack of Koelsch beer",
+            "gross_weight": {"unit": "KGM", "value": 3.922},
+            "events": [
+                {
+                    "@id": "event-1",
+                    "event_code": "FOH",
+                    "event_type_indicator": "Actual",
+                    "date_time": "2022-10-10T19:49:10Z",
+                },
+                {
+                    "@id": "event-2",
+                    "event_code": "RCS",
+                    "event_type_indicator": "Actual",
+                    "date_time": "2022-10-10T19:49:10Z",
+                },
+            ],
+        }
+    )
+    piece_b: Piece = piece_a.copy(deep=True)
+    piece_b.gross_weight.value = 4.0
+    piece_b.events[1].event_code = "DEP"
+    piece_b.events.append(
+        Event(
+            id="event-3",
+            event_code="ARR",
+            event_type_indicator=EventTypeIndicator.ACTUAL,
+            date_time=datetime(2022, 10, 11, 8, 0, 0),
+        )
+    )
+    patch_request: PatchRequest = generate_patch_request(
+        original_logistics_object=piece_a,
+        updated_logistics_object=piece_b,
+        requestor_company_identifier="cgnbeerbrewery",
+    )
+    operations = [
+        (operation.op, operation.p, operation.o.value)
+        for operation in patch_request.operations
+    ]
+    # predicates are IRIs, changed nested objects are replaced as a whole
+    events_iri = "https://onerecord.iata.org/LogisticsObject#events"
+    gross_weight_iri = "https://onerecord.iata.org/Piece#grossWeight"
+    assert [(op, p) for op, p, _ in operations] == [
+        ("del", events_iri),
+        ("add", events_iri),
+        ("add", events_iri),
+        ("del", gross_weight_iri),
+        ("add", gross_weight_iri),
+    ]
+    assert '"RCS"' in operations[0][2] and "event-2" in operations[0][2]
+    assert '"DEP"' in operations[1][2] and "event-2" in operations[1][2]
+    assert "event-3" in operations[2][2]
+    assert "3.922" in operations[3][2] and "4.0" in operations[4][2]
+
+    patch_request = generate_patch_request(
+        original_logistics_object=piece_a,
+        updated_logistics_object=piece_b,
+        requestor_company_identifier="cgnbeerbrewery",
+        nested_paths=True,
+    )
+    operations = [
+        (operation.op, operation.p, operation.o.value)
+        for operation in patch_request.operations
+    ]
+    events_path = "/https:~1~1onerecord.iata.org~1LogisticsObject#events"
+    event_code_path = (
+        f"{events_path}/event-2/https:~1~1onerecord.iata.org~1Event#eventCode"
+    )
+    gross_weight_path = "/https:~1~1onerecord.iata.org~1Piece#grossWeight/https:~1~1onerecord.iata.org~1Value#value"
+    assert operations[:5] == [
+        ("del", event_code_path, "RCS"),
+        ("add", event_code_path, "DEP"),
+        ("add", "https://onerecord.iata.org/LogisticsObject#events", operations[2][2]),
+        ("del", gross_weight_path, "3.922"),
+        ("add", gross_weight_path, "4.0"),
+    ]
+    assert "event-3" in operations[2][2]
+    assert len(operations) == 5
+
+
+def test_generate_patch_request_keyed_lists():
+    events: list[Event] = [
+        Event(
+            id=f"event-{i}",
+            event_code="FOH",
+            event_type_indicator=EventTypeIndicator.ACTUAL,
+            date_time=datetime(2022, 10, 10, 19, 49, 10),
+        )
+        for i in range(500)
+    ]
+    piece_a: Piece = Piece(
+        id="http://localhost:8080/companies/cgnbeerbrewery/piece-1153586115",
+        type=["https://onerecord.iata.org/Piece"],
+        company_identifier="test",
+        goods_description="six pack of Koelsch beer",
+        gross_weight=Value(value=3.922, unit="KGM"),
+        events=events,
+        shipping_marks=["a", "b", "c"],
+    )
+
+    def operations(piece_b: Piece) -> list[tuple]:
+        return [
+            (operation.op, operation.p, operation.o.value)
+            for operation in generate_patch_request(
+                piece_a, piece_b, "cgnbeerbrewery"
+            ).operations
+        ]
+
+    piece_b = piece_a.copy(deep=True)
+    piece_b.events.append(events[0].copy(update={"id": "event-500"}))
+    added = operations(piece_b)
+    assert len(added) == 1
+    assert added[0][:2] == ("add", "https://onerecord.iata.org/LogisticsObject#events")
+    assert "event-500" in added[0][2]
+
+    piece_b = piece_a.copy(deep=True)
+    piece_b.events.reverse()
+    del piece_b.events[250]
+    removed = operations(piece_b)
+    assert len(removed) == 1
+    assert removed[0][0] == "del" and "event-249" in removed[0][2]
+
+    piece_b = piece_a.copy(deep=True)
+    piece_b.shipping_marks = ["a", "x", "c", "d"]
+    assert operations(piece_b) == [
+        ("del", "https://onerecord.iata.org/Piece#shippingMarks", "b"),
+        ("add", "https://onerecord.iata.org/Piece#shippingMarks", "x"),
+        ("add", "https://onerecord.iata.org/Piece#shippingMarks", "d"),
+    ]
+
+
+def test_apply_patch_request():
+    piece_a: Piece = Piece(
+        id="http://localhost:8080/companies/cgnbeerbrewery/piece-1153586115",
+        type=["https://onerecord.iata.org/Piece"],
+        company_identifier="test",
+        goods_description="six pack of Koelsch beer",
+        gross_weight=Value(value=3.922, unit="KGM"),
+        upid="4711-1337-1",
+        events=[
+            Event(
+                id=f"event-{i}",
+                event_code="FOH",
+                event_type_indicator=EventTypeIndicator.ACTUAL,
+                date_time=datetime(2022, 10, 10, 19, 49, 10),
+            )
+            for i in range(3)
+        ],
+        shipping_marks=["a", "b", "c"],
+    )
+    piece_a._revision = 3
+    piece_b: Piece = piece_a.copy(deep=True)
+    piece_b.gross_weight.value = 4.0
+    piece_b.upid = None
+    piece_b.nvd_for_customs = True
+    piece_b.events[1].event_code = "DEP"
+    piece_b.events[1].event_type_indicator = EventTypeIndicator.PLANNED
+    del piece_b.events[0]
+    piece_b.events.append(piece_a.events[0].copy(update={"id": "event-3"}))
+    piece_b.shipping_marks = ["a", "x", "c", "d"]
+
+    for nested_paths in (False, True):
+        patch_request: PatchRequest = generate_patch_request(
+            piece_a, piece_b, "cgnbeerbrewery", nested_paths=nested_paths
+        )
+        piece_c = apply_patch_request(piece_a, patch_request)
+        assert piece_c._revision == 4
+        assert piece_a._revision == 3 and piece_a.gross_weight.value == 3.922
+        assert piece_c.gross_weight.value == 4.0
+        assert piece_c.upid is None
+        assert piece_c.nvd_for_customs is True
+        events = {event.id: event for event in piece_c.events}
+        assert sorted(events) == ["event-1", "event-2", "event-3"]
+        assert events["event-1"].event_code == "DEP"
+        assert events["event-1"].event_type_indicator == EventTypeIndicator.PLANNED
+        assert events["event-3"].date_time.replace(tzinfo=None) == (
+            piece_a.events[0].date_time
+        )
+        assert piece_c.shipping_marks == ["a", "c", "x", "d"]
+        with pytest.raises(ValueError):
+            apply_patch_request(piece_c, patch_request)
+        with pytest.raises(ValueError):
+            apply_patch_request(piece_b.copy(update={"id": "piece-2"}), patch_request)
+
+
+def test_generate_patch_request_tracked_changes():
+    piece_a: Piece = Piece(
+        id="http://localhost:8080/companies/cgnbeerbrewery/piece-1153586115",
+        type=["https://onerecord.iata.org/Piece"],
+        company_identifier="test",
+        goods_description="six pack of Koelsch beer",
+        gross_weight=Value(value=3.922, unit="KGM"),
+        shipping_marks=["a"],
+    )
+    piece_b: Piece = piece_a.copy(deep=True)
+    piece_b.track_changes()
+    assert generate_patch_request(piece_a, piece_b, "test").operations == []
+
+    piece_b.gross_weight.value = 4.0
+    piece_b.shipping_marks.append("b")
+    # not tracked, e.g. the state of piece_a was not the baseline of piece_b
+    piece_b.__dict__["upid"] = "4711"
+    operations = [
+        (operation.op, operation.p, operation.o.value)
+        for operation in generate_patch_request(
+            piece_a, piece_b, "test", nested_paths=True
+        ).operations
+    ]
+    gross_weight_path = "/https:~1~1onerecord.iata.org~1Piece#grossWeight/https:~1~1onerecord.iata.org~1Value#value"
+    assert operations == [
+        ("del", gross_weight_path, "3.922"),
+        ("add", gross_weight_path, "4.0"),
+        ("add", "https://onerecord.iata.org/Piece#shippingMarks", "b"),
+    ]
+    assert [
+        operation.p
+        for operation in generate_patch_request(piece_a, piece_b, "test").operations
+    ] == [
+        "https://onerecord.iata.org/Piece#grossWeight",
+        "https://onerecord.iata.org/Piece#grossWeight",
+        "https://onerecord.iata.org/Piece#shippingMarks",
+    ]